@@ -0,0 +1,240 @@
+"""
+Micro-benchmarks for the conversion and rendering kernels.
+
+    python benchmarks/bench_kernels.py                      # run and print
+    python benchmarks/bench_kernels.py --save               # record baseline
+    python benchmarks/bench_kernels.py --compare            # fail on regressions
+
+Inputs are synthetic and seeded, so runs on the same machine are comparable.
+Where the Rust extension is built, its output is also checked against the
+NumPy path before anything is timed.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from ascii_art import ansi, converter, image_resize, writer  # noqa: E402
+from ascii_art.charset import CHARSETS  # noqa: E402
+
+try:
+    from ascii_art import ascii_art_rs
+except ImportError:
+    ascii_art_rs = None
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+
+# (width, height) of the rendered grid; resize_image starts from 8x that size
+SIZES = {
+    "small": (80, 24),
+    "medium": (200, 60),
+    "large": (480, 135),
+}
+
+SEED = 1234
+
+DEFAULT_CHARSET = CHARSETS["default"]
+
+
+def synthetic_image(width, height, seed=SEED):
+    """
+    Smooth gradients with a band of noise: long color runs (the common case
+    for run-length coalescing) next to cells that all differ (the worst case).
+    """
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width]
+    arr = np.empty((height, width, 3), dtype=np.uint8)
+    arr[..., 0] = (x * 255 // max(1, width - 1)).astype(np.uint8)
+    arr[..., 1] = (y * 255 // max(1, height - 1)).astype(np.uint8)
+    arr[..., 2] = ((x + y) * 4 % 256).astype(np.uint8)
+
+    band = slice(height // 3, 2 * height // 3)
+    arr[band] = rng.integers(0, 256, arr[band].shape, dtype=np.uint8)
+    return Image.fromarray(arr, "RGB")
+
+
+def measure(fn, repeat, min_time=0.05):
+    """Times fn() `repeat` times, each sample looping until min_time passes."""
+    fn()  # Warm caches (LUTs, palette cubes)
+
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        if time.perf_counter() - start >= min_time:
+            break
+        loops *= 2
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append((time.perf_counter() - start) / loops)
+
+    return {
+        "min_ms": min(samples) * 1000,
+        "median_ms": statistics.median(samples) * 1000,
+        "loops": loops,
+    }
+
+
+def kernels(size):
+    """Yields (name, zero-argument callable) for every kernel at `size`."""
+    width, height = SIZES[size]
+    img = synthetic_image(width, height)
+    source = synthetic_image(width * 8, height * 8)
+    frame = converter.image_to_ascii_with_color(img, DEFAULT_CHARSET)
+    gray_rows = converter.image_to_ascii(img, DEFAULT_CHARSET)
+    rgb = np.asarray(img)
+
+    yield "image_to_ascii", lambda: converter.image_to_ascii(img, DEFAULT_CHARSET)
+    yield "image_to_ascii_with_color", lambda: converter.image_to_ascii_with_color(
+        img, DEFAULT_CHARSET
+    )
+    yield "frame_to_ansi", lambda: ansi.frame_to_ansi(frame)
+    gray = converter.luminance(rgb)
+    gray_renderer = converter.GrayRenderer(DEFAULT_CHARSET)
+    yield "gray_renderer", lambda: gray_renderer.render(gray)
+    if ascii_art_rs is not None:
+        chars = list(DEFAULT_CHARSET)
+        yield "render_frame_to_string", lambda: ascii_art_rs.render_frame_to_string(
+            rgb, chars, 0
+        )
+        yield "image_to_indices_rs", lambda: ascii_art_rs.image_to_indices_rs(
+            rgb, len(chars)
+        )
+    yield "resize_image", lambda: image_resize.resize_image(source, width, height)
+    yield "generate_html", lambda: writer.generate_html(frame)
+    yield "generate_html_gray", lambda: writer.generate_html(gray_rows)
+
+
+def check_parity():
+    """
+    Compares the Rust renderer with the NumPy path on every size and a few
+    tolerances. Returns a list of mismatch descriptions (empty when equal).
+    """
+    if ascii_art_rs is None:
+        return []
+
+    chars = list(DEFAULT_CHARSET)
+    problems = []
+    for size, (width, height) in SIZES.items():
+        img = synthetic_image(width, height)
+        rgb = np.asarray(img)
+        frame = converter.image_to_ascii_with_color(img, DEFAULT_CHARSET)
+        indices, _ = ascii_art_rs.image_to_indices_rs(rgb, len(chars))
+        expected_indices = converter.build_index_lut(len(chars))[rgb.max(axis=2)]
+        if not np.array_equal(indices, expected_indices):
+            problems.append(f"image_to_indices_rs {size}")
+        for tolerance in (0, 8, 32):
+            expected = ansi.frame_to_ansi(frame, tolerance=tolerance)
+            got = ascii_art_rs.render_frame_to_string(rgb, chars, tolerance)
+            if got != expected:
+                problems.append(f"render_frame_to_string {size} tol={tolerance}")
+    return problems
+
+
+def run(sizes, repeat):
+    results = {}
+    for size in sizes:
+        for name, fn in kernels(size):
+            key = f"{name}[{size}]"
+            results[key] = measure(fn, repeat)
+            r = results[key]
+            print(f"{key:<40} {r['median_ms']:9.3f} ms  (min {r['min_ms']:.3f})")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Returns the kernels whose median grew by more than `threshold`x."""
+    regressions = []
+    for key, r in results.items():
+        old = baseline.get("results", {}).get(key)
+        if old is None:
+            continue
+        ratio = r["median_ms"] / old["median_ms"]
+        marker = "  <-- regression" if ratio > threshold else ""
+        print(f"{key:<40} {ratio:6.2f}x baseline{marker}")
+        if ratio > threshold:
+            regressions.append(key)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--size",
+        action="append",
+        choices=list(SIZES),
+        help="Grid size to run (repeatable, default: all).",
+    )
+    parser.add_argument("--repeat", type=int, default=7, help="Samples per kernel.")
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=BASELINE_PATH,
+        help=f"Baseline file (default: {BASELINE_PATH.name}).",
+    )
+    parser.add_argument(
+        "--save", action="store_true", help="Write the results as the new baseline."
+    )
+    parser.add_argument(
+        "--compare", action="store_true", help="Exit 1 if any kernel regressed."
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.25,
+        help="Median slowdown counted as a regression (default: 1.25x).",
+    )
+    args = parser.parse_args()
+
+    backend = "rust + numpy" if ascii_art_rs is not None else "numpy (no Rust ext)"
+    print(f"Backend: {backend}, Python {platform.python_version()}\n")
+
+    mismatches = check_parity()
+    if mismatches:
+        print("❌ Backends disagree:")
+        for m in mismatches:
+            print(f"  • {m}")
+        sys.exit(1)
+    if ascii_art_rs is not None:
+        print("✅ Rust and NumPy outputs match.\n")
+
+    results = run(args.size or list(SIZES), args.repeat)
+
+    if args.compare:
+        if not args.baseline.exists():
+            print(f"\nError: No baseline at {args.baseline}. Run with --save first.")
+            sys.exit(1)
+        print()
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} kernel(s) regressed.")
+            sys.exit(1)
+
+    if args.save:
+        payload = {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "backend": backend,
+            "results": results,
+        }
+        args.baseline.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+        print(f"\n✅ Baseline saved to: {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+# src/ascii_art/ansi.py
+from functools import lru_cache
+
+import numpy as np
+
+from .frame import glyph_table
+
+RESET = "\033[0m"
+
+# Supported --color-depth values
+COLOR_DEPTHS = (24, 256, 16)
+
+# Bits kept per channel when indexing the palette lookup cube (32x32x32)
+LUT_BITS = 5
+
+# Standard xterm values for the 16 system colors
+XTERM_16 = [
+    (0, 0, 0), (205, 0, 0), (0, 205, 0), (205, 205, 0),
+    (0, 0, 238), (205, 0, 205), (0, 205, 205), (229, 229, 229),
+    (127, 127, 127), (255, 0, 0), (0, 255, 0), (255, 255, 0),
+    (92, 92, 255), (255, 0, 255), (0, 255, 255), (255, 255, 255),
+]  # fmt: skip
+
+
+@lru_cache(maxsize=None)
+def xterm_palette(depth):
+    """
+    Returns (codes, rgb) for the palette used at `depth` (256 or 16).
+    The 256-color mode matches against the 6x6x6 cube and the gray ramp
+    (codes 16-255) since the first 16 entries vary between terminals.
+    """
+    if depth == 16:
+        return np.arange(16, dtype=np.uint8), np.array(XTERM_16, dtype=np.int32)
+
+    levels = np.array([0, 95, 135, 175, 215, 255])
+    r, g, b = np.meshgrid(levels, levels, levels, indexing="ij")
+    cube = np.stack([r.ravel(), g.ravel(), b.ravel()], axis=1)
+    grays = np.repeat((8 + 10 * np.arange(24))[:, None], 3, axis=1)
+    rgb = np.concatenate([cube, grays]).astype(np.int32)
+    return np.arange(16, 256, dtype=np.uint8), rgb
+
+
+@lru_cache(maxsize=None)
+def palette_lut(depth):
+    """
+    Precomputed quantized RGB cube mapping (r, g, b) >> (8 - LUT_BITS) to the
+    nearest palette code. Built once per depth and cached.
+    Returns: flat uint8 array of length 2 ** (3 * LUT_BITS).
+    """
+    codes, rgb = xterm_palette(depth)
+    shift = 8 - LUT_BITS
+    steps = np.arange(1 << LUT_BITS) << shift
+    centers = steps + (1 << shift) // 2
+
+    r, g, b = np.meshgrid(centers, centers, centers, indexing="ij")
+    grid = np.stack([r.ravel(), g.ravel(), b.ravel()], axis=1).astype(np.int32)
+
+    lut = np.empty(len(grid), dtype=np.uint8)
+    chunk = 4096
+    for i in range(0, len(grid), chunk):
+        block = grid[i : i + chunk]
+        dist = ((block[:, None, :] - rgb[None, :, :]) ** 2).sum(axis=2)
+        lut[i : i + chunk] = codes[np.argmin(dist, axis=1)]
+    return lut
+
+
+def palette_codes(colors, depth):
+    """Maps an (..., 3) uint8 RGB array to palette codes of shape (...)."""
+    shift = 8 - LUT_BITS
+    q = (colors >> shift).astype(np.intp)
+    flat = (q[..., 0] << (2 * LUT_BITS)) | (q[..., 1] << LUT_BITS) | q[..., 2]
+    return palette_lut(depth)[flat]
+
+
+@lru_cache(maxsize=None)
+def palette_sgr(depth):
+    """SGR foreground sequence for every palette code at `depth`."""
+    if depth == 16:
+        return [f"\033[{30 + c if c < 8 else 82 + c}m" for c in range(16)]
+    return [f"\033[38;5;{c}m" for c in range(256)]
+
+
+def color_keys(colors, depth=24):
+    """
+    What the terminal will actually show for each color: the RGB values
+    themselves in TrueColor mode, palette codes otherwise.
+    """
+    if depth == 24:
+        return colors
+    return palette_codes(colors, depth)
+
+
+def run_sgr(keys, depth=24, tolerance=0):
+    """
+    Finds the color runs in a flat sequence of color keys (see color_keys).
+    Tolerance only applies to TrueColor keys.
+    Returns: (bool mask of run starts, list of SGR strings for those starts).
+    """
+    if depth == 24:
+        starts = color_run_starts(keys, tolerance)
+        return starts, [f"\033[38;2;{r};{g};{b}m" for r, g, b in keys[starts].tolist()]
+
+    starts = np.zeros(len(keys), dtype=bool)
+    if len(keys):
+        starts[0] = True
+        starts[1:] = keys[1:] != keys[:-1]
+    table = palette_sgr(depth)
+    return starts, [table[c] for c in keys[starts].tolist()]
+
+
+def color_run_starts(colors, tolerance=0):
+    """
+    Marks the cells of an (N, 3) color array that start a new color run.
+    With tolerance > 0, a cell joins the current run while every channel is
+    within `tolerance` of the color that opened the run.
+    Returns: bool array of shape (N,).
+    """
+    n = len(colors)
+    starts = np.zeros(n, dtype=bool)
+    if n == 0:
+        return starts
+
+    c = colors.astype(np.int16)
+    starts[0] = True
+    if tolerance <= 0:
+        starts[1:] = np.any(c[1:] != c[:-1], axis=1)
+        return starts
+
+    # Anchored runs are inherently sequential; walk plain ints for speed.
+    flat = c.tolist()
+    ar, ag, ab = flat[0]
+    for i in range(1, n):
+        r, g, b = flat[i]
+        if (
+            abs(r - ar) > tolerance
+            or abs(g - ag) > tolerance
+            or abs(b - ab) > tolerance
+        ):
+            starts[i] = True
+            ar, ag, ab = r, g, b
+    return starts
+
+
+def frame_to_ansi(frame, pad=".", tolerance=0, depth=24):
+    """
+    Renders a colored AsciiFrame to one ANSI string.
+    Every glyph is followed by `pad` (aspect ratio) and every row by a newline.
+
+    An SGR sequence is only emitted when the color changes (run-length
+    coalescing), and a single reset closes the frame. `depth` selects
+    TrueColor (24) or the xterm 256/16 color palettes.
+    """
+    h, w = frame.shape
+    if h == 0 or w == 0:
+        return "\n" * h
+
+    text = frame.to_text(pad)
+    cell_width = 1 + len(pad)
+    row_width = w * cell_width + 1
+
+    keys = color_keys(frame.colors, depth)
+    keys = keys.reshape(h * w, *keys.shape[2:])
+    mask, sgr = run_sgr(keys, depth, tolerance)
+    starts = np.flatnonzero(mask)
+    offsets = (starts // w) * row_width + (starts % w) * cell_width
+    ends = offsets[1:].tolist() + [len(text)]
+
+    parts = []
+    for code, start, end in zip(sgr, offsets.tolist(), ends):
+        parts.append(code)
+        parts.append(text[start:end])
+    parts.append(RESET)
+    return "".join(parts)
+
+
+def cursor_to(row, col):
+    """CUP sequence for a zero-based (row, col) screen position."""
+    return f"\033[{row + 1};{col + 1}H"
+
+
+class DeltaRenderer:
+    """
+    Differential renderer for consecutive frames of the same size.
+
+    Keeps the glyph indices and colors that are currently on screen and, for
+    each new frame, emits cursor-positioning sequences plus only the cells
+    that changed. When more than `threshold` of the cells changed, diff()
+    returns None so the caller can repaint the whole frame instead.
+    """
+
+    def __init__(self, pad=".", tolerance=0, threshold=0.5, depth=24):
+        self.pad = pad
+        self.tolerance = tolerance
+        self.threshold = threshold
+        self.depth = depth
+        self.reset()
+
+    def reset(self):
+        """Forgets the screen contents; the next frame is a full repaint."""
+        self._indices = None
+        self._keys = None
+
+    def _store(self, frame, keys):
+        self._indices = frame.indices.copy()
+        self._keys = keys.copy() if keys is not None else None
+
+    def diff(self, frame):
+        """
+        Returns the escape string that turns the previous frame into `frame`,
+        or None when a full repaint is needed. The stored screen state is
+        updated either way.
+        """
+        keys = color_keys(frame.colors, self.depth) if frame.has_color else None
+
+        prev = self._indices
+        if (
+            prev is None
+            or prev.shape != frame.shape
+            or (self._keys is None) != (keys is None)
+        ):
+            self._store(frame, keys)
+            return None
+
+        changed = frame.indices != prev
+        if keys is not None and self.depth == 24:
+            drift = np.abs(keys.astype(np.int16) - self._keys).max(axis=2)
+            changed |= drift > self.tolerance
+        elif keys is not None:
+            changed |= keys != self._keys
+
+        count = int(np.count_nonzero(changed))
+        if count == 0:
+            return ""
+        if count > self.threshold * changed.size:
+            self._store(frame, keys)
+            return None
+
+        # Only redrawn cells update the stored state, so slow color drift
+        # below the tolerance is still caught once it adds up.
+        prev[changed] = frame.indices[changed]
+        if keys is not None:
+            self._keys[changed] = keys[changed]
+
+        ys, xs = np.nonzero(changed)
+        cell_width = 1 + len(self.pad)
+
+        # Consecutive changed cells on one row share a single cursor move
+        jumps = np.ones(count, dtype=bool)
+        jumps[1:] = (ys[1:] != ys[:-1]) | (xs[1:] != xs[:-1] + 1)
+
+        # The SGR pen survives cursor moves, so color runs span the jumps
+        recolor = np.zeros(count, dtype=bool)
+        sgr = []
+        if keys is not None:
+            recolor, sgr = run_sgr(keys[ys, xs], self.depth, self.tolerance)
+
+        table = glyph_table(frame.charset, self.pad)
+        text = table[frame.indices[ys, xs]].tobytes().decode("utf-32-le")
+
+        events = np.flatnonzero(jumps | recolor)
+        ends = events[1:].tolist() + [count]
+        ys, xs = ys.tolist(), xs.tolist()
+        codes = iter(sgr)
+
+        parts = []
+        for start, end in zip(events.tolist(), ends):
+            if jumps[start]:
+                parts.append(cursor_to(ys[start], xs[start] * cell_width))
+            if recolor[start]:
+                parts.append(next(codes))
+            parts.append(text[start * cell_width : end * cell_width])
+
+        if keys is not None:
+            parts.append(RESET)
+        return "".join(parts)
@@ -0,0 +1,203 @@
+# src/ascii_art/asv.py
+#
+# ASV: a container of pre-rendered terminal frames.
+#
+# Layout (all integers little-endian):
+#
+#   header   32 bytes   magic "ASCV", version, flags, columns, rows,
+#                       fps (f64), frame count, index offset
+#   payload             the terminal bytes of every frame, back to back
+#   index    24 bytes   per frame: payload offset, length, flags,
+#                       presentation time in microseconds
+#
+# Keyframes are full repaints from the top-left corner; other frames are
+# deltas against the frame before them. Frame 0 is always a keyframe, so
+# playback can start (and loop) there.
+import mmap
+import struct
+
+import numpy as np
+
+from . import ui
+from .scheduler import PlaybackScheduler
+from .sink import FrameSink
+
+MAGIC = b"ASCV"
+VERSION = 1
+
+HEADER = struct.Struct("<4sHHHHdIQ")
+
+INDEX_DTYPE = np.dtype(
+    [("offset", "<u8"), ("length", "<u4"), ("flags", "<u4"), ("pts_us", "<u8")]
+)
+
+# Index flags
+KEYFRAME = 1
+
+
+class AsvWriter:
+    """
+    Appends rendered frames to an .asv file. The index and final header are
+    written by close(); until then the header marks the file as empty.
+    """
+
+    def __init__(self, path, columns, rows, fps):
+        self.path = path
+        self.columns = columns
+        self.rows = rows
+        self.fps = fps
+        self._index = []
+        self._f = open(path, "wb")
+        self._write_header(index_offset=0)
+        self._offset = HEADER.size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _write_header(self, index_offset):
+        self._f.seek(0)
+        self._f.write(
+            HEADER.pack(
+                MAGIC,
+                VERSION,
+                0,
+                self.columns,
+                self.rows,
+                self.fps,
+                len(self._index),
+                index_offset,
+            )
+        )
+
+    def add(self, data, keyframe=False):
+        """Appends one frame's terminal output (str) at the next time slot."""
+        payload = data.encode("utf-8")
+        pts_us = round(len(self._index) * 1_000_000 / self.fps)
+        flags = KEYFRAME if keyframe else 0
+        self._index.append((self._offset, len(payload), flags, pts_us))
+        self._f.write(payload)
+        self._offset += len(payload)
+
+    @property
+    def frame_count(self):
+        return len(self._index)
+
+    def close(self):
+        if self._f.closed:
+            return
+        index = np.array(self._index, dtype=INDEX_DTYPE)
+        self._f.write(index.tobytes())
+        self._write_header(index_offset=self._offset)
+        self._f.close()
+
+
+class AsvFile:
+    """Read-only, memory-mapped view of an .asv file."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mm) < HEADER.size:
+            self.close()
+            raise ValueError("Not an ASV file (too short).")
+        (
+            magic,
+            version,
+            _,
+            self.columns,
+            self.rows,
+            self.fps,
+            count,
+            index_offset,
+        ) = HEADER.unpack_from(self._mm)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError("Not an ASV file (bad magic).")
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"Unsupported ASV version {version}.")
+        if count == 0:
+            # The header only gets its count once close() writes the index
+            self.close()
+            raise ValueError("ASV file has no frames (incomplete or empty export?).")
+        if index_offset + count * INDEX_DTYPE.itemsize > len(self._mm):
+            self.close()
+            raise ValueError("ASV file is truncated (incomplete export?).")
+
+        self.index = np.frombuffer(
+            self._mm, dtype=INDEX_DTYPE, count=count, offset=index_offset
+        )
+        self.data = memoryview(self._mm)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self):
+        return len(self.index)
+
+    def frame(self, i):
+        """Zero-copy memoryview of frame i's terminal bytes."""
+        offset, length = int(self.index[i]["offset"]), int(self.index[i]["length"])
+        return self.data[offset : offset + length]
+
+    def close(self):
+        # Views into the map must be released before it can close
+        self.index = None
+        view = getattr(self, "data", None)
+        if view is not None:
+            view.release()
+            self.data = None
+        self._mm.close()
+
+
+def play(path, args):
+    """
+    Plays an .asv file: every frame is a slice of the memory map written
+    straight to stdout, so there is no decoding or rendering at all.
+    Frames are never dropped since deltas depend on their predecessor;
+    a late frame is simply written without sleeping.
+    """
+    try:
+        asv = AsvFile(path)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: Could not open '{path}': {e}")
+        return
+
+    ui.clear_terminal()
+    sink = FrameSink()
+
+    scheduler = PlaybackScheduler(asv.fps)
+    offsets = asv.index["offset"].tolist()
+    lengths = asv.index["length"].tolist()
+    view = asv.data
+
+    try:
+        sink.start()
+        scheduler.start()
+        shown = 0
+        while True:
+            for offset, length in zip(offsets, lengths):
+                # Frames are due at start + n / fps across loops too
+                scheduler.wait(shown)
+                shown += 1
+                if length:
+                    sink.write_frame(view[offset : offset + length])
+            if not args.loop:
+                break
+    except KeyboardInterrupt:
+        ui.clear_terminal()
+        print("\nStopped.")
+    finally:
+        sink.close()
+        scheduler.stop()
+        del view
+        asv.close()
+
+    print(f"\n{scheduler.format_report()}")
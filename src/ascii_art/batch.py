@@ -0,0 +1,181 @@
+# src/ascii_art/batch.py
+import glob
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from . import charset as charset_mod
+from . import converter, dither, image_resize, render_cache, strips, writer
+from .image_loader import IMAGE_EXTENSIONS
+
+# How many failures to list individually in the summary
+MAX_LISTED_FAILURES = 20
+
+
+def collect_inputs(source):
+    """
+    Expands a directory or a glob pattern into a sorted list of image paths.
+    Directories are scanned non-recursively; use a '**' glob to recurse.
+    """
+    p = Path(source)
+    if p.is_dir():
+        candidates = p.iterdir()
+    else:
+        candidates = (Path(m) for m in glob.glob(source, recursive=True))
+
+    return sorted(
+        c for c in candidates if c.is_file() and c.suffix.lower() in IMAGE_EXTENSIONS
+    )
+
+
+def output_names(paths):
+    """
+    Picks a distinct auto-naming stem for every input. Inputs whose names
+    would clash (photo.png and photo.jpg, or a/x.png and b/x.png) are named
+    after their path below the common folder, extension included; anything
+    still clashing gets a numeric suffix.
+    Returns: list of stems, in the order of `paths`.
+    """
+    stems = [writer.clean_filename(p.name) for p in paths]
+    # Case-insensitive, as on the default macOS and Windows filesystems
+    clashes = Counter(stem.casefold() for stem in stems)
+    root = Path(os.path.commonpath([p.parent for p in paths]))
+    for i, path in enumerate(paths):
+        if clashes[stems[i].casefold()] > 1:
+            relative = "_".join(path.relative_to(root).parts)
+            stems[i] = writer.clean_filename(relative.replace(".", "_"))
+
+    names = []
+    taken = set()
+    for stem in stems:
+        name, n = stem, 1
+        while name.casefold() in taken:
+            n += 1
+            name = f"{stem}-{n}"
+        taken.add(name.casefold())
+        names.append(name)
+    return names
+
+
+def convert_file(path, chars, args, name=None):
+    """
+    Converts and saves one image. Runs inside a worker process.
+    `name` replaces the file's own name when auto-naming the output.
+    Returns: (path, output_path or None, error message or None).
+    """
+    try:
+        with strips.open_image(path) as img:
+            target_w, target_h = image_resize.resolve_dimensions(
+                img, args.width, args.height, args.aspect_ratio, args.downsize
+            )
+
+            ditherer = dither.make_ditherer(args.dither, len(chars))
+
+            def convert():
+                if strips.should_stream(img):
+                    return strips.image_to_ascii(
+                        img,
+                        target_w,
+                        target_h,
+                        chars,
+                        color=args.color,
+                        dither=ditherer,
+                    )
+                img_resized = image_resize.scale_image(
+                    img, target_w, target_h, color=args.color
+                )
+                if args.color:
+                    return converter.image_to_ascii_with_color(
+                        img_resized, chars, ditherer
+                    )
+                return converter.image_to_ascii(img_resized, chars, ditherer)
+
+            cache, key = None, None
+            if not args.no_cache:
+                cache = render_cache.RenderCache()
+                params = render_cache.output_params(args, chars, target_w, target_h)
+                key = render_cache.make_key(
+                    render_cache.digest_file(path),
+                    "html" if args.html else "txt",
+                    params,
+                )
+
+            output_path = writer.save_art(
+                convert,
+                original_filename=name or path,
+                output_folder=args.output_folder,
+                as_html=args.html,
+                cache=cache,
+                cache_key=key,
+            )
+        if output_path is None:
+            return path, None, "could not save output"
+        return path, output_path, None
+
+    except Exception as e:
+        return path, None, str(e) or e.__class__.__name__
+
+
+def _convert_star(task):
+    return convert_file(*task)
+
+
+def run_batch(args):
+    """
+    Converts every image matched by --batch with a process pool.
+    Per-file failures are collected and reported at the end instead of
+    aborting the run; the exit code is 1 if anything failed.
+    """
+    if args.output_file_name:
+        print("❌ Error: --output-file-name cannot be used with --batch.")
+        sys.exit(1)
+
+    try:
+        chars = charset_mod.get_charset(args.charset)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    paths = collect_inputs(args.batch)
+    if not paths:
+        print(f"Error: No images found for '{args.batch}'.")
+        sys.exit(1)
+
+    jobs = args.jobs or os.cpu_count() or 1
+    jobs = min(jobs, len(paths))
+    # Hand out work in chunks so IPC overhead stays small for tiny images
+    chunksize = max(1, len(paths) // (jobs * 4))
+
+    print(f"Converting {len(paths)} images with {jobs} workers...")
+    start = time.perf_counter()
+
+    names = output_names(paths)
+    tasks = ((path, chars, args, name) for path, name in zip(paths, names))
+    failures = []
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for path, _, error in pool.map(_convert_star, tasks, chunksize=chunksize):
+            if error:
+                failures.append((path, error))
+
+    if not args.no_cache:
+        # Workers' size estimates can race; settle the cache size once
+        render_cache.RenderCache().evict()
+
+    elapsed = time.perf_counter() - start
+    done = len(paths) - len(failures)
+    rate = len(paths) / elapsed if elapsed > 0 else 0.0
+
+    print(
+        f"\nBatch finished: {done}/{len(paths)} converted in {elapsed:.2f}s "
+        f"({rate:.1f} images/s)."
+    )
+    if failures:
+        print(f"❌ {len(failures)} failed:")
+        for path, error in failures[:MAX_LISTED_FAILURES]:
+            print(f"  • {path}: {error}")
+        if len(failures) > MAX_LISTED_FAILURES:
+            print(f"  ... and {len(failures) - MAX_LISTED_FAILURES} more.")
+        sys.exit(1)
@@ -15,6 +15,9 @@ CHARSETS = {
     "tech": " ⠂⠔⠦⠶⠷▏░⠿▎▍▒▓▌▟▋▊▉█",
 }
 
+# Glyph indices are stored as uint8
+MAX_CHARSET_LENGTH = 256
+
 CONFIG_FILE = Path.home() / ".asciify_config.json"
 
 
@@ -28,10 +31,14 @@ def get_charset(custom_charset=None):
     """
     # 1. Custom CLI Override
     if custom_charset:
-        if isinstance(custom_charset, str) and len(custom_charset) > 0:
-            return custom_charset
-        else:
+        if not isinstance(custom_charset, str) or len(custom_charset) == 0:
             raise ValueError("Custom charset must be a non-empty string.")
+        if len(custom_charset) > MAX_CHARSET_LENGTH:
+            raise ValueError(
+                f"Custom charset cannot contain more than "
+                f"{MAX_CHARSET_LENGTH} characters."
+            )
+        return custom_charset
 
     # 2. Check Persistent Config
     saved_charset_name = load_persistent_charset_name()
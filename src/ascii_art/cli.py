@@ -5,8 +5,21 @@ import sys
 from pathlib import Path
 
 from . import charset as charset_mod
-from . import (converter, image_loader, image_resize, server, terminal, ui,
-               writer)
+from . import ui
+
+# Everything else is imported on the code path that needs it: NumPy/PIL for
+# conversions, OpenCV only for video, the HTTP server only for --full.
+
+
+def positive_int(value):
+    """argparse type for counts that must be at least 1."""
+    try:
+        n = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {n}")
+    return n
 
 
 def parse_args():
@@ -17,6 +30,17 @@ def parse_args():
     # --- INPUT ---
     parser.add_argument("-i", "--input-file", help="Path to input image file")
 
+    parser.add_argument(
+        "--batch",
+        metavar="DIR_OR_GLOB",
+        help="Convert every image in a directory or glob and save the results",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=positive_int,
+        help="Worker processes for --batch and video export (default: all cores)",
+    )
+
     # --- MODE SWITCH ---
     parser.add_argument(
         "--full", action="store_true", help="Launch the legacy interactive mode"
@@ -34,6 +58,24 @@ def parse_args():
         "--html", action="store_true", help="Save as HTML file (preserves color)"
     )
     parser.add_argument("--color", action="store_true", help="Enable colorized output")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Skip the on-disk render and URL caches (always re-render/download)",
+    )
+    parser.add_argument(
+        "--color-depth",
+        type=int,
+        choices=[24, 256, 16],
+        default=24,
+        help="Color palette for --color: 24 (TrueColor), 256 or 16",
+    )
+    parser.add_argument(
+        "--color-tolerance",
+        type=int,
+        default=0,
+        help="Treat colors within this per-channel distance as one run (0-255)",
+    )
 
     # --- DIMENSION FLAGS ---
     parser.add_argument("--width", type=int, help="Target width")
@@ -49,6 +91,57 @@ def parse_args():
     parser.add_argument(
         "-c", "--charset", help="Use a specific charset string for this run"
     )
+    parser.add_argument(
+        "--dither",
+        choices=["none", "bayer", "blue-noise", "floyd-steinberg"],
+        default="none",
+        help="Dither luminance before picking glyphs (smoother gradients, "
+        "most visible with short charsets like blocks or binary)",
+    )
+
+    # --- VIDEO FLAGS ---
+    parser.add_argument(
+        "--no-delta",
+        action="store_true",
+        help="Repaint every video frame in full instead of only changed cells",
+    )
+    parser.add_argument(
+        "--export-format",
+        choices=["cast", "asv"],
+        default="cast",
+        help="File written when saving a video: asciicast v2 recording (cast) "
+        "or pre-rendered ASV container for zero-compute playback (asv)",
+    )
+    parser.add_argument(
+        "--loop", action="store_true", help="Loop playback of an .asv file"
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream the video live to browsers (Server-Sent Events) "
+        "instead of playing it in the terminal",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8000,
+        help="Port for --stream (default: 8000)",
+    )
+
+    # --- DIAGNOSTICS ---
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="-",
+        metavar="JSON_FILE",
+        help="Record per-stage wall/CPU time and peak memory as JSON "
+        "(to JSON_FILE, or stderr if omitted)",
+    )
+    parser.add_argument(
+        "--profile-cprofile",
+        metavar="PSTATS_FILE",
+        help="With --profile, also dump a cProfile run to PSTATS_FILE",
+    )
 
     # --- LEGACY/FULL MODE ONLY ---
     parser.add_argument(
@@ -67,6 +160,8 @@ def run_legacy_interactive_mode(args):
     """
     The old interactive workflow for --full flag
     """
+    from . import converter, image_loader, image_resize, server, writer
+
     if args.no_animate:
         ui.CONFIG["animate"] = False
 
@@ -108,7 +203,7 @@ def run_legacy_interactive_mode(args):
         target_w, target_h = image_resize.interactive_downsize_factor(img)
 
     # Resize
-    img_resized = image_resize.resize_image(img, target_w, target_h)
+    img_resized = image_resize.scale_image(img, target_w, target_h, color=False)
 
     # Charset
     try:
@@ -157,9 +252,29 @@ def main():
                 sys.exit()
             ui.clear_terminal()
 
-    # --- 3. BRANCH: TERMINAL MODE (DEFAULT) ---
+    # --- 3. BRANCH: BATCH MODE ---
+    if args.batch:
+        from . import batch
+
+        batch.run_batch(args)
+        return
+
+    # --- 4. BRANCH: TERMINAL MODE (DEFAULT) ---
     # This handles -i, configuration, printing, and saving
-    terminal.run_terminal_pipeline(args)
+    from . import terminal
+
+    if args.profile is None:
+        terminal.run_terminal_pipeline(args)
+        return
+
+    from . import profiling
+
+    profiling.start(cprofile_path=args.profile_cprofile)
+    try:
+        terminal.run_terminal_pipeline(args)
+    finally:
+        # Also written when the pipeline exits early with an error
+        profiling.finish(args.profile)
 
 
 if __name__ == "__main__":
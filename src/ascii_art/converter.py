@@ -1,53 +1,177 @@
 # src/ascii_art/converter.py
 import numpy as np
 
-# Try to import the Rust extension.
+from .charset import MAX_CHARSET_LENGTH
+from .frame import AsciiFrame, gather_text, glyph_table
+
+# Native kernels (fall back to NumPy when the extension is not built)
 try:
-    from .ascii_art_rs import image_to_ascii_rs
+    from .ascii_art_rs import GrayRenderer as NativeGrayRenderer
+    from .ascii_art_rs import image_to_indices_rs
 except ImportError:
-    image_to_ascii_rs = None
+    NativeGrayRenderer = None
+    image_to_indices_rs = None
+
+# Every glyph is followed by this padding to correct the terminal aspect ratio.
+GRAY_PAD = " "
+
+
+def build_index_lut(charset_len):
+    """
+    Precomputes the 256-entry table mapping each byte value to a charset index.
+    Returns: uint8 array of shape (256,).
+    """
+    if charset_len < 1:
+        raise ValueError("Charset must be a non-empty string.")
+    if charset_len > MAX_CHARSET_LENGTH:
+        # Larger indices would wrap around in uint8
+        raise ValueError(
+            f"Charset cannot contain more than {MAX_CHARSET_LENGTH} characters."
+        )
+
+    scale = (charset_len - 1) / 255
+    return (np.arange(256) * scale).astype(np.uint8)
 
 
-def image_to_ascii(img, charset):
+def build_glyph_lut(charset, pad=GRAY_PAD):
     """
-    Converts a PIL image to a 2D list of characters (Grayscale).
+    Precomputes a 256-entry table mapping each byte value to its padded glyph.
+    Entries are UTF-32 code points so whole frames can be gathered with NumPy
+    indexing and decoded into a single string in one pass.
+    Returns: uint32 array of shape (256, 1 + len(pad)).
     """
-    arr = np.array(img)
+    return glyph_table(charset, pad)[build_index_lut(len(charset))]
 
-    # Handle dimensions (Height, Width)
-    if len(arr.shape) == 3:
-        gray_arr = np.max(arr[:, :, :3], axis=2)
-    else:
-        gray_arr = arr
 
-    scale = (len(charset) - 1) / 255
-    indices = (gray_arr * scale).astype(int)
+def luminance(arr):
+    """
+    Reduces an image array to a single uint8 channel using max(R, G, B).
+    Single-channel arrays are passed through (clipped to uint8 if needed).
+    """
+    if arr.ndim == 3:
+        arr = np.max(arr[:, :, :3], axis=2)
+    if arr.dtype == np.bool_:
+        return arr.astype(np.uint8) * 255
+    if arr.dtype != np.uint8:
+        arr = np.clip(arr, 0, 255).astype(np.uint8)
+    return arr
 
-    ascii_grid = []
-    for row in indices:
-        ascii_row = [charset[i] for i in row]
-        ascii_grid.append(ascii_row)
 
-    return ascii_grid
+def gray_to_text(gray, lut):
+    """
+    Renders a 2D uint8 array to one string using a table from build_glyph_lut.
+    Each row is terminated by a newline (including the last one).
+    """
+    return gather_text(gray, lut)
 
 
-def image_to_ascii_with_color(img, charset):
+class GrayRenderer:
     """
-    Converts a PIL image to a 2D list of tuples: (character, (r, g, b)).
-    NOW ACCELERATED BY RUST (Target A).
+    Renders (H, W) luminance frames to UTF-8 terminal text: padded glyphs,
+    rows joined by newlines (no trailing newline). Every frame is written
+    into the same bytearray, so playback allocates no per-frame strings.
     """
-    if image_to_ascii_rs is None:
-        raise ImportError(
-            "Rust extension 'ascii_art_rs' not found. Please build with 'maturin develop'."
+
+    def __init__(self, charset, pad=GRAY_PAD):
+        self.buffer = bytearray()
+        self._native = None
+        if NativeGrayRenderer is not None:
+            self._native = NativeGrayRenderer(charset, pad)
+
+        # Fallback: with equal-width cells (the usual case) the glyph bytes
+        # are gathered straight into the buffer; otherwise via a string.
+        cells = [(c + pad).encode("utf-8") for c in charset]
+        self._max_cell = max(len(cell) for cell in cells)
+        self._table = None
+        self._lut = None
+        if len({len(cell) for cell in cells}) == 1:
+            table = np.frombuffer(b"".join(cells), dtype=np.uint8)
+            self._table = table.reshape(len(cells), -1)[build_index_lut(len(charset))]
+        else:
+            self._lut = build_glyph_lut(charset, pad)
+
+    def render(self, gray):
+        """
+        Returns a memoryview of the frame's bytes in self.buffer, valid until
+        the next call. The buffer is sized for the widest glyphs, so it only
+        grows when the frame shape does; release the view before that.
+        """
+        if self._native is not None:
+            n = self._native.render_into(gray, self.buffer)
+        elif self._table is not None:
+            n = self._render_fixed(gray)
+        else:
+            h, w = gray.shape
+            self._reserve(h * (w * self._max_cell + 1))
+            data = gray_to_text(gray, self._lut)[:-1].encode("utf-8")
+            n = len(data)
+            # Same-length slice assignment: written in place, never resized
+            self.buffer[:n] = data
+        return memoryview(self.buffer)[:n]
+
+    def _reserve(self, size):
+        if len(self.buffer) < size:
+            self.buffer.extend(bytes(size - len(self.buffer)))
+
+    def _render_fixed(self, gray):
+        h, w = gray.shape
+        cell = self._table.shape[1]
+        stride = w * cell + 1
+        self._reserve(h * stride)
+
+        rows = np.ndarray((h, stride), dtype=np.uint8, buffer=self.buffer)
+        cells = np.ndarray(
+            (h, w, cell), dtype=np.uint8, buffer=self.buffer, strides=(stride, cell, 1)
         )
+        # mode="clip" lets take() write into the strided view without a temporary
+        np.take(self._table, gray, axis=0, out=cells, mode="clip")
+        rows[:, -1] = ord("\n")
+        return max(0, h * stride - 1)
+
+
+def image_to_ascii(img, charset, dither=None):
+    """
+    Converts a PIL image to a list of finished row strings (Grayscale).
+    Rows already carry the aspect-ratio padding and no trailing newline.
+    `dither` is an optional dither.Ditherer applied to the luminance.
+    """
+    gray = luminance(np.asarray(img))
+    if dither is not None:
+        gray = dither(gray)
+    text = gray_to_text(gray, build_glyph_lut(charset))
+    return text.split("\n")[:-1]
 
-    # Ensure image is RGB to guarantee 3 channels
-    img_rgb = img.convert("RGB")
-    arr = np.array(img_rgb)
 
-    # Convert the string "abc" into a list ["a", "b", "c"]
-    # Rust expects a Vec<String>, so we must provide a Python List of strings.
-    charset_list = list(charset)
+def array_to_frame(arr, charset, dither=None):
+    """
+    Builds an AsciiFrame from an (H, W, 3) uint8 RGB array or an (H, W)
+    luminance array. An RGB array becomes the frame's color buffer (no copy).
+    With a dither.Ditherer, glyphs come from the dithered luminance.
+    """
+    if (
+        dither is None
+        and image_to_indices_rs is not None
+        and arr.ndim == 3
+        and arr.shape[2] == 3
+        and arr.dtype == np.uint8
+    ):
+        # One pass over the pixels, returned as arrays (no per-cell objects)
+        indices, colors = image_to_indices_rs(arr, len(charset))
+        return AsciiFrame(indices, charset, colors=colors)
+
+    gray = luminance(arr)
+    if dither is not None:
+        gray = dither(gray)
+    indices = build_index_lut(len(charset))[gray]
+    colors = arr if arr.ndim == 3 else None
+    return AsciiFrame(indices, charset, colors=colors)
+
 
-    # Pass the heavy lifting to Rust
-    return image_to_ascii_rs(arr, charset_list)
+def image_to_ascii_with_color(img, charset, dither=None):
+    """
+    Converts a PIL image to a colored AsciiFrame
+    (glyph indices plus an RGB array, see frame.AsciiFrame).
+    """
+    # Ensure image is RGB to guarantee 3 channels
+    img_rgb = img.convert("RGB")
+    return array_to_frame(np.asarray(img_rgb), charset, dither)
@@ -0,0 +1,181 @@
+# src/ascii_art/dither.py
+#
+# Dithering of luminance frames before they are mapped to glyphs.
+#
+# Glyph k covers luminance [k * step, (k + 1) * step) with step = 255 / (n - 1)
+# (see converter.build_index_lut), so a flat area always lands on the same
+# glyph and gradients band. Every mode here returns a new uint8 luminance
+# array whose glyphs average out to the original tone instead.
+from functools import lru_cache
+
+import numpy as np
+
+from .converter import build_index_lut
+
+try:
+    from .ascii_art_rs import floyd_steinberg_rs
+except ImportError:
+    floyd_steinberg_rs = None
+
+DITHER_MODES = ("none", "bayer", "blue-noise", "floyd-steinberg")
+
+BAYER_SIZE = 8
+BLUE_NOISE_SIZE = 64
+
+# Gaussian radius for void-and-cluster (Ulichney's recommended 1.5)
+BLUE_NOISE_SIGMA = 1.5
+BLUE_NOISE_SEED = 2026
+
+
+def bayer_matrix(size=BAYER_SIZE):
+    """Ordered-dither thresholds in (0, 1) for a power-of-two `size`."""
+    m = np.zeros((1, 1), dtype=np.int64)
+    while m.shape[0] < size:
+        m = np.block([[4 * m, 4 * m + 2], [4 * m + 3, 4 * m + 1]])
+    return (m + 0.5) / m.size
+
+
+@lru_cache(maxsize=None)
+def blue_noise(size=BLUE_NOISE_SIZE, sigma=BLUE_NOISE_SIGMA, seed=BLUE_NOISE_SEED):
+    """
+    Tileable blue-noise thresholds in (0, 1), built with void-and-cluster:
+    points are ranked by repeatedly removing the tightest cluster and
+    filling the largest void, measured by a toroidal Gaussian energy.
+    Deterministic for a given seed; computed once per process.
+    """
+    n = size * size
+    d = np.minimum(np.arange(size), size - np.arange(size))
+    kernel = np.exp(-(d[:, None] ** 2 + d[None, :] ** 2) / (2 * sigma**2)).ravel()
+    # Energy contributed by a point at flat index i (rolled copies of kernel)
+    rows, cols = np.divmod(np.arange(n), size)
+
+    def splat(i):
+        y, x = rows[i], cols[i]
+        return np.roll(kernel.reshape(size, size), (y, x), axis=(0, 1)).ravel()
+
+    rng = np.random.default_rng(seed)
+    pattern = np.zeros(n, dtype=bool)
+    pattern[rng.choice(n, n // 10, replace=False)] = True
+    energy = np.zeros(n)
+    for i in np.flatnonzero(pattern):
+        energy += splat(i)
+
+    # Relax the random start into an evenly spread pattern
+    for _ in range(n):
+        cluster = np.argmax(np.where(pattern, energy, -np.inf))
+        pattern[cluster] = False
+        energy -= splat(cluster)
+        void = np.argmin(np.where(pattern, np.inf, energy))
+        pattern[void] = True
+        energy += splat(void)
+        if void == cluster:
+            break
+
+    ranks = np.empty(n, dtype=np.int64)
+    ones = int(pattern.sum())
+
+    # Ranks below the start: peel off the tightest clusters
+    p, e = pattern.copy(), energy.copy()
+    for rank in range(ones - 1, -1, -1):
+        cluster = np.argmax(np.where(p, e, -np.inf))
+        p[cluster] = False
+        e -= splat(cluster)
+        ranks[cluster] = rank
+
+    # Ranks above it: fill the largest voids
+    p, e = pattern.copy(), energy.copy()
+    for rank in range(ones, n):
+        void = np.argmin(np.where(p, np.inf, e))
+        p[void] = True
+        e += splat(void)
+        ranks[void] = rank
+
+    return ((ranks + 0.5) / n).reshape(size, size)
+
+
+def level_values(levels):
+    """Lowest luminance byte that maps to each glyph index."""
+    return np.searchsorted(build_index_lut(levels), np.arange(levels)).astype(np.uint8)
+
+
+def floyd_steinberg(gray, levels):
+    """
+    Floyd–Steinberg error diffusion to `levels` glyphs. Uses the native
+    kernel when built; the NumPy fallback walks anti-diagonals (pixels with
+    equal 2y + x do not depend on each other) and gives identical output.
+    """
+    values = level_values(levels)
+    if floyd_steinberg_rs is not None:
+        return floyd_steinberg_rs(np.ascontiguousarray(gray), values)
+
+    h, w = gray.shape
+    out = np.empty((h, w), dtype=np.uint8)
+    # Incoming error per pixel, in 1/16ths of a luminance step
+    err = np.zeros((h + 1, w + 2), dtype=np.int32)
+    src = gray.astype(np.int32) * 16
+    full = 255 * 16
+
+    for t in range(2 * (h - 1) + w if h and w else 0):
+        y = np.arange(max(0, (t - w + 2) // 2), min(h - 1, t // 2) + 1)
+        x = t - 2 * y
+        # err is padded by one column on each side and one row below
+        value = np.clip(src[y, x] + err[y, x + 1], 0, full)
+        k = (value * (levels - 1) + 255 * 8) // full
+        e = value - (k * full) // (levels - 1)
+        out[y, x] = values[k]
+
+        err[y, x + 2] += (e * 7) // 16
+        err[y + 1, x] += (e * 3) // 16
+        err[y + 1, x + 1] += (e * 5) // 16
+        err[y + 1, x + 2] += e // 16
+
+    return out
+
+
+class Ditherer:
+    """
+    Applies one dithering mode to (H, W) uint8 luminance frames for a
+    charset of `levels` glyphs. Ordered modes tile a threshold map whose
+    offsets are cached per frame shape, so each frame costs one add.
+    """
+
+    def __init__(self, mode, levels):
+        if mode not in DITHER_MODES:
+            raise ValueError(f"Unknown dither mode '{mode}'.")
+        self.mode = mode
+        self.levels = levels
+        self._offsets = None
+        self._tiles = {}
+        if mode in ("bayer", "blue-noise") and levels > 1:
+            thresholds = bayer_matrix() if mode == "bayer" else blue_noise()
+            step = 255 / (levels - 1)
+            self._offsets = np.rint(thresholds * step).astype(np.uint16)
+
+    def _tile(self, h, w, y0):
+        n = self._offsets.shape[0]
+        key = (h, w, y0 % n)
+        tile = self._tiles.get(key)
+        if tile is None:
+            rows = (np.arange(h) + y0) % n
+            cols = np.arange(w) % self._offsets.shape[1]
+            tile = self._tiles[key] = self._offsets[rows[:, None], cols]
+        return tile
+
+    def __call__(self, gray, y0=0):
+        """
+        Returns the dithered frame. `y0` is the frame's first row in the
+        full image, so bands of one image tile seamlessly.
+        """
+        if self.levels < 2 or self.mode == "none":
+            return gray
+        if self.mode == "floyd-steinberg":
+            return floyd_steinberg(gray, self.levels)
+        tile = self._tile(*gray.shape, y0)
+        return np.minimum(gray + tile, 255).astype(np.uint8)
+
+
+def make_ditherer(mode, levels):
+    """A Ditherer for `mode`, or None for "none" so hot paths skip it."""
+    if mode is None or mode == "none":
+        return None
+    return Ditherer(mode, levels)
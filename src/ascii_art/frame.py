@@ -0,0 +1,115 @@
+# src/ascii_art/frame.py
+import numpy as np
+
+from .charset import MAX_CHARSET_LENGTH
+
+
+def glyph_table(charset, pad=""):
+    """
+    Builds a (len(charset), 1 + len(pad)) table of UTF-32 code points:
+    one row per glyph, followed by the padding characters.
+    """
+    table = np.empty((len(charset), 1 + len(pad)), dtype="<u4")
+    table[:, 0] = [ord(c) for c in charset]
+    for i, c in enumerate(pad, start=1):
+        table[:, i] = ord(c)
+    return table
+
+
+def gather_text(indices, table):
+    """
+    Gathers table rows for every cell of a 2D index array and decodes the
+    result into one string. Each row is terminated by a newline.
+    """
+    h, w = indices.shape
+    cell_width = table.shape[1]
+
+    buf = np.empty((h, w * cell_width + 1), dtype="<u4")
+    buf[:, :-1] = table[indices].reshape(h, w * cell_width)
+    buf[:, -1] = ord("\n")
+    return buf.tobytes().decode("utf-32-le")
+
+
+def _as_slice(key):
+    """Turns an integer index into a length-1 slice so frames stay 2D."""
+    if isinstance(key, slice):
+        return key
+    key = int(key)
+    return slice(key, key + 1 if key != -1 else None)
+
+
+class AsciiFrame:
+    """
+    Compact, array-backed ASCII art frame.
+
+    indices: (H, W) uint8 array of positions into `charset`.
+    colors:  optional (H, W, 3) uint8 RGB array.
+    charset: the string the indices refer to (shared, never copied).
+
+    Slicing returns a view: frame[10:20, 5:50] shares memory with frame.
+    """
+
+    __slots__ = ("indices", "colors", "charset")
+
+    def __init__(self, indices, charset, colors=None):
+        if indices.ndim != 2:
+            raise ValueError("indices must be a 2D array.")
+        if colors is not None and colors.shape[:2] != indices.shape:
+            raise ValueError("colors must have the same height/width as indices.")
+        if len(charset) > MAX_CHARSET_LENGTH:
+            raise ValueError(
+                f"Charset cannot contain more than {MAX_CHARSET_LENGTH} characters."
+            )
+
+        self.indices = indices
+        self.colors = colors
+        self.charset = charset
+
+    @property
+    def shape(self):
+        return self.indices.shape
+
+    @property
+    def height(self):
+        return self.indices.shape[0]
+
+    @property
+    def width(self):
+        return self.indices.shape[1]
+
+    @property
+    def has_color(self):
+        return self.colors is not None
+
+    @property
+    def nbytes(self):
+        """Bytes held by the backing arrays (shared buffers counted in full)."""
+        total = self.indices.nbytes
+        if self.colors is not None:
+            total += self.colors.nbytes
+        return total
+
+    def __len__(self):
+        return self.height
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key, slice(None))
+        if len(key) != 2:
+            raise IndexError("AsciiFrame takes at most two indices (rows, cols).")
+
+        key = (_as_slice(key[0]), _as_slice(key[1]))
+        colors = self.colors[key] if self.colors is not None else None
+        return AsciiFrame(self.indices[key], self.charset, colors)
+
+    def crop(self, x, y, width, height):
+        """Returns a view of the rectangle starting at column x, row y."""
+        return self[y : y + height, x : x + width]
+
+    def to_text(self, pad=" "):
+        """Plain text with `pad` after every glyph and a newline after every row."""
+        return gather_text(self.indices, glyph_table(self.charset, pad))
+
+    def rows(self, pad=" "):
+        """Finished row strings without trailing newlines."""
+        return self.to_text(pad).split("\n")[:-1]
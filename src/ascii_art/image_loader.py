@@ -6,22 +6,28 @@ from pathlib import Path
 
 from PIL import Image
 
+from . import profiling, render_cache, strips
 from . import url_image_loader  # Import new handler
 from .ui import clear_terminal, cool_print
 
 # --- SMART PATHING LOGIC ---
 REPO_INPUT = Path("assets/input")
-if REPO_INPUT.exists() and REPO_INPUT.is_dir():
-    INPUT_DIR = REPO_INPUT
-    MODE = "REPO"
-else:
-    INPUT_DIR = Path(".")
-    MODE = "USER"
 
 IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".webp", ".tiff"}
 
 
+def resolve_input_dir():
+    """
+    Returns (INPUT_DIR, MODE). Checked when the picker runs rather than at
+    import time, so importing this module never touches the filesystem.
+    """
+    if REPO_INPUT.exists() and REPO_INPUT.is_dir():
+        return REPO_INPUT, "REPO"
+    return Path("."), "USER"
+
+
 def list_and_select_image():
+    INPUT_DIR, MODE = resolve_input_dir()
     files = []
     for filepath in INPUT_DIR.iterdir():
         if filepath.is_file():
@@ -88,14 +94,18 @@ def _smart_preview(path):
         return False
 
 
-def load_image(source, preview=True):
+def load_image(source, preview=True, use_cache=True):
     """
     Loads an image from a Path object OR a URL string.
+    use_cache: allow reusing the local URL cache for downloads.
     """
     # 1. URL HANDLING
     if isinstance(source, str) and source.startswith(("http://", "https://")):
         # URLs are never previewed (we don't save to disk)
-        data, filename = url_image_loader.download_image(source)
+        with profiling.stage("download"):
+            data, filename = url_image_loader.download_image(
+                source, use_cache=use_cache
+            )
         if not data:
             return None
 
@@ -104,6 +114,8 @@ def load_image(source, preview=True):
             # Attach the original filename to the object metadata
             # This allows terminal.py to use it for saving without a real file path
             img.info["custom_filename"] = filename
+            # Content digest for the render cache (there is no file to hash)
+            img.info["source_digest"] = render_cache.digest_bytes(data.getvalue())
             return img
         except Exception as e:
             cool_print(f"Error opening downloaded image data: {e}\n")
@@ -111,7 +123,7 @@ def load_image(source, preview=True):
 
     # 2. LOCAL FILE HANDLING
     try:
-        img = Image.open(source)
+        img = strips.open_image(source)
         if preview:
             cool_print(f"Opening {source} for preview...\n")
             success = _smart_preview(source)
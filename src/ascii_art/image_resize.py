@@ -1,8 +1,9 @@
 # src/ascii_art/image_resize.py
 import shutil
 
-from PIL import Image
+from PIL import Image, ImageChops
 
+from . import profiling
 from .ui import cool_print
 
 
@@ -31,10 +32,79 @@ def calculate_dimensions(img, target_w=None, target_h=None, ratio=None):
     return None, None
 
 
+def resolve_dimensions(img, width=None, height=None, ratio=None, downsize=None):
+    """
+    Picks the output size from the dimension flags, in CLI priority order:
+    width/height, then downsize factor, then fit-to-terminal.
+    Raises ValueError with a user-facing message on invalid input.
+    """
+    if width or height:
+        return calculate_dimensions(img, width, height, ratio)
+
+    if downsize:
+        try:
+            factor = float(downsize)
+        except ValueError:
+            factor = 0
+        if factor <= 0:
+            raise ValueError("--downsize must be a positive number.")
+        return int(img.width / factor), int(img.height / factor)
+
+    return get_auto_terminal_dimensions(img)
+
+
 def resize_image(img, width, height):
     return img.resize((width, height), Image.Resampling.LANCZOS)
 
 
+# The cheap decode-time reductions stop at this multiple of the target size,
+# leaving the final step to LANCZOS so quality matches a full-size resize.
+REDUCE_MARGIN = 2
+
+# Modes Image.reduce() averages correctly (palette and bilevel images can't be)
+REDUCIBLE_MODES = {"L", "LA", "RGB", "RGBA", "RGBX", "I", "F"}
+
+
+def luminance_image(img):
+    """
+    Collapses an RGB(A) image to one "L" band holding max(R, G, B), the same
+    luminance converter.luminance computes. Other modes are returned as is.
+    """
+    if img.mode not in ("RGB", "RGBA", "RGBX"):
+        return img
+    r, g, b = img.split()[:3]
+    return ImageChops.lighter(r, ImageChops.lighter(g, b))
+
+
+def scale_image(img, width, height, color=True):
+    """
+    Resizes to (width, height) without decoding more pixels than needed.
+
+    1. JPEGs are decoded at 1/2, 1/4 or 1/8 scale via draft mode (DCT scaling)
+       when the target is small enough. Only works before the image is loaded.
+    2. Image.reduce() box-averages away any remaining integer factor.
+    3. With color off, the image becomes single-channel luminance so the
+       final LANCZOS pass touches one band instead of three.
+    """
+    want_w, want_h = width * REDUCE_MARGIN, height * REDUCE_MARGIN
+
+    with profiling.stage("decode"):
+        if img.format == "JPEG" and img.mode in ("RGB", "L", "CMYK", "YCbCr"):
+            img.draft(img.mode, (want_w, want_h))
+        img.load()
+
+    with profiling.stage("resize"):
+        factor_x = max(1, img.width // want_w)
+        factor_y = max(1, img.height // want_h)
+        if (factor_x > 1 or factor_y > 1) and img.mode in REDUCIBLE_MODES:
+            img = img.reduce((factor_x, factor_y))
+
+        if not color:
+            img = luminance_image(img)
+
+        return resize_image(img, width, height)
+
+
 def interactive_downsize_factor(img, bypass_downsizing=False):
     orig_w, orig_h = img.size
     cool_print(f"\nOriginal dimensions: {orig_w}x{orig_h}\n")
@@ -0,0 +1,131 @@
+# src/ascii_art/prefetch.py
+import queue
+import threading
+
+import cv2
+import numpy as np
+
+# Marks the end of the stream in the queue
+_END = object()
+
+
+def process_frame(frame, size, color=False):
+    """
+    Resizes a BGR frame to `size` (width, height) with INTER_AREA and returns
+    (H, W, 3) RGB when `color` is set, otherwise (H, W) max(B, G, R).
+    """
+    frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+    if color:
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    # max(B, G, R) is channel-order independent, so skip cvtColor.
+    return np.max(frame, axis=2)
+
+
+class FramePrefetcher:
+    """
+    Decodes and resizes video frames on a worker thread into a bounded queue.
+
+    OpenCV releases the GIL while decoding and resizing, so this overlaps with
+    rendering and terminal output on the main thread. Frames come out ready to
+    render: (H, W, 3) RGB when `color` is set, otherwise (H, W) luminance.
+
+    Counters:
+        frames_decoded:  frames pushed into the queue so far.
+        consumer_stalls: read() calls that found the queue empty and waited.
+        producer_stalls: times the worker found the queue full and waited.
+    """
+
+    def __init__(self, cap, width, height, color=False, depth=8):
+        self.cap = cap
+        self.size = (width, height)
+        self.color = color
+
+        self.frames_decoded = 0
+        self.consumer_stalls = 0
+        self.producer_stalls = 0
+
+        self._queue = queue.Queue(maxsize=max(1, depth))
+        self._stop = threading.Event()
+        self._error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    @property
+    def depth(self):
+        """Number of frames currently waiting in the queue."""
+        return self._queue.qsize()
+
+    def stats(self):
+        return {
+            "queue_depth": self.depth,
+            "queue_capacity": self._queue.maxsize,
+            "frames_decoded": self.frames_decoded,
+            "consumer_stalls": self.consumer_stalls,
+            "producer_stalls": self.producer_stalls,
+        }
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        """Stops the worker and drains the queue so it can exit."""
+        self._stop.set()
+        while self._thread.is_alive():
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            self._thread.join(timeout=0.05)
+
+    def _process(self, frame):
+        # OpenCV expects (width, height)
+        return process_frame(frame, self.size, self.color)
+
+    def _put(self, item):
+        if self._queue.full():
+            self.producer_stalls += 1
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self):
+        try:
+            while not self._stop.is_set():
+                ret, frame = self.cap.read()
+                if not ret:
+                    break
+                if not self._put(self._process(frame)):
+                    return
+                self.frames_decoded += 1
+        except Exception as e:
+            self._error = e
+        self._put(_END)
+
+    def read(self):
+        """
+        Returns the next processed frame, or None at the end of the stream.
+        Re-raises any exception hit by the worker.
+        """
+        try:
+            item = self._queue.get_nowait()
+        except queue.Empty:
+            self.consumer_stalls += 1
+            item = self._queue.get()
+
+        if item is _END:
+            # Leave the marker for any further read() calls
+            self._queue.put(_END)
+            if self._error is not None:
+                raise self._error
+            return None
+        return item
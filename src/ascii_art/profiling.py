@@ -0,0 +1,196 @@
+# src/ascii_art/profiling.py
+import json
+import sys
+import time
+from contextlib import nullcontext
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Shared no-op context handed out while profiling is off
+_NULL = nullcontext()
+
+# The Profiler collecting data for this run (None when --profile is off)
+_active = None
+
+
+def peak_rss_mb():
+    """High-water mark of the process RSS in MB (None where unsupported)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / scale, 1)
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 3)
+
+
+def percentiles(samples):
+    """Summary of a list of durations (seconds) in milliseconds."""
+    ordered = sorted(samples)
+    n = len(ordered)
+
+    def pick(p):
+        return _ms(ordered[min(n - 1, int(p * n))])
+
+    return {
+        "count": n,
+        "mean_ms": _ms(sum(ordered) / n),
+        "p50_ms": pick(0.50),
+        "p90_ms": pick(0.90),
+        "p99_ms": pick(0.99),
+        "max_ms": _ms(ordered[-1]),
+    }
+
+
+class _Stage:
+    """Times one pass through a named stage and adds it to the totals."""
+
+    __slots__ = ("profiler", "name", "wall", "cpu")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self.wall
+        cpu = time.process_time() - self.cpu
+        self.profiler._add_stage(self.name, wall, cpu)
+
+
+class _Sample:
+    """Records one per-frame duration for a named stage."""
+
+    __slots__ = ("samples", "start")
+
+    def __init__(self, samples):
+        self.samples = samples
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.samples.append(time.perf_counter() - self.start)
+
+
+class Profiler:
+    """
+    Collects wall time, CPU time and the peak RSS reached for each pipeline
+    stage, plus per-frame duration samples for video playback.
+    """
+
+    def __init__(self, cprofile_path=None):
+        self.stages = {}
+        self.frames = {}
+        self.notes = {}
+        self.start_wall = time.perf_counter()
+        self.start_cpu = time.process_time()
+        self.cprofile_path = cprofile_path
+        self._cprofile = None
+        if cprofile_path:
+            import cProfile
+
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def stage(self, name):
+        return _Stage(self, name)
+
+    def sample(self, name):
+        return _Sample(self.frames.setdefault(name, []))
+
+    def _add_stage(self, name, wall, cpu):
+        entry = self.stages.get(name)
+        if entry is None:
+            entry = self.stages[name] = {"calls": 0, "wall": 0.0, "cpu": 0.0}
+        entry["calls"] += 1
+        entry["wall"] += wall
+        entry["cpu"] += cpu
+        entry["peak_rss_mb"] = peak_rss_mb()
+
+    def report(self):
+        """Everything recorded so far as a JSON-serializable dict."""
+        return {
+            "argv": sys.argv[1:],
+            "total": {
+                "wall_ms": _ms(time.perf_counter() - self.start_wall),
+                "cpu_ms": _ms(time.process_time() - self.start_cpu),
+                "peak_rss_mb": peak_rss_mb(),
+            },
+            "stages": {
+                name: {
+                    "calls": entry["calls"],
+                    "wall_ms": _ms(entry["wall"]),
+                    "cpu_ms": _ms(entry["cpu"]),
+                    "peak_rss_mb": entry["peak_rss_mb"],
+                }
+                for name, entry in self.stages.items()
+            },
+            "frames": {
+                name: percentiles(samples)
+                for name, samples in self.frames.items()
+                if samples
+            },
+            **self.notes,
+        }
+
+    def finish(self, path=None):
+        """
+        Stops the cProfile run (dumping it to cprofile_path) and writes the
+        JSON report to `path`, or to stderr so it never mixes with the art.
+        """
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self.cprofile_path)
+
+        text = json.dumps(self.report(), indent=2)
+        if path and path != "-":
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+        else:
+            sys.stderr.write(text + "\n")
+
+
+def start(cprofile_path=None):
+    """Turns profiling on for the rest of the run."""
+    global _active
+    _active = Profiler(cprofile_path)
+    return _active
+
+
+def finish(path=None):
+    global _active
+    if _active is not None:
+        _active.finish(path)
+        _active = None
+
+
+def note(key, value):
+    """Adds a top-level entry (e.g. playback stats) to the JSON report."""
+    if _active is not None:
+        _active.notes[key] = value
+
+
+def stage(name):
+    """Context manager timing a pipeline stage (a no-op unless profiling)."""
+    if _active is None:
+        return _NULL
+    return _active.stage(name)
+
+
+def sample(name):
+    """Context manager recording one per-frame duration (a no-op unless profiling)."""
+    if _active is None:
+        return _NULL
+    return _active.sample(name)
@@ -0,0 +1,195 @@
+# src/ascii_art/render_cache.py
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from .__version__ import __version__
+
+# --- CACHE CONFIG ---
+CACHE_DIR = Path(
+    os.environ.get("ASCIIFY_CACHE_DIR", Path.home() / ".cache" / "asciify" / "renders")
+)
+MAX_CACHE_BYTES = int(os.environ.get("ASCIIFY_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+# Eviction trims the cache to this fraction of the cap, so the next full
+# scan is only due after that much new data
+EVICT_TO = 0.9
+
+# Running estimate of the cache size in bytes, kept next to the entries
+USAGE_FILE = "usage"
+
+# Bump whenever a rendered output format changes within a release
+FORMAT_REVISION = 3
+
+
+def digest_bytes(data):
+    return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+
+def digest_file(path):
+    with open(path, "rb") as f:
+        return hashlib.file_digest(
+            f, lambda: hashlib.blake2b(digest_size=20)
+        ).hexdigest()
+
+
+def output_params(args, chars, width, height):
+    """Every setting that changes the rendered output, for use in cache keys."""
+    params = {
+        "width": width,
+        "height": height,
+        "charset": chars,
+        "color": bool(args.color),
+    }
+    # Absent when off, so existing cache entries stay valid
+    if args.dither != "none":
+        params["dither"] = args.dither
+    if args.color:
+        params["color_depth"] = args.color_depth
+        params["color_tolerance"] = args.color_tolerance
+    return params
+
+
+def make_key(source_digest, kind, params):
+    """
+    Content-addressed key: hash of the input bytes' digest, the output kind
+    ("ansi", "txt", "html", ...), the render parameters and the package
+    version plus FORMAT_REVISION (so format changes never serve stale renders).
+    """
+    payload = json.dumps(
+        {
+            "version": __version__,
+            "revision": FORMAT_REVISION,
+            "source": source_digest,
+            "kind": kind,
+            **params,
+        },
+        sort_keys=True,
+    )
+    return digest_bytes(payload.encode("utf-8"))
+
+
+class RenderCache:
+    """
+    On-disk store of finished renders (text, ANSI or HTML), keyed by make_key.
+    Entries are plain files; reading one refreshes its mtime, and writes evict
+    the least recently used entries once the total size passes `max_bytes`.
+
+    Writes only add their size to a running estimate in USAGE_FILE; the
+    directory is scanned when that estimate crosses the cap (or is missing),
+    and the scan stores the exact total. Concurrent writers may lose an
+    update to the estimate, so batch runs call evict() once at the end.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def _path(self, key):
+        return self.directory / key[:2] / key
+
+    def get_path(self, key):
+        """Returns the entry's path (marking it recently used) or None."""
+        path = self._path(key)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def get_text(self, key):
+        path = self.get_path(key)
+        if path is None:
+            return None
+        try:
+            return path.read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def _store(self, key, write):
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file and rename so readers never see partial data
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    write(f)
+                    size = f.tell()
+                os.replace(tmp, path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except OSError:
+            return  # Caching is best-effort
+
+        usage = self._read_usage()
+        if usage is None or usage + size > self.max_bytes:
+            self.evict()
+        else:
+            self._write_usage(usage + size)
+
+    def _read_usage(self):
+        try:
+            return int((self.directory / USAGE_FILE).read_text())
+        except (OSError, ValueError):
+            return None
+
+    def _write_usage(self, total):
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+            with os.fdopen(fd, "w") as f:
+                f.write(str(total))
+            os.replace(tmp, self.directory / USAGE_FILE)
+        except OSError:
+            pass
+
+    def put_text(self, key, text):
+        self._store(key, lambda f: f.write(text.encode("utf-8")))
+
+    def put_file(self, key, source):
+        def copy(f):
+            with open(source, "rb") as src:
+                shutil.copyfileobj(src, f)
+
+        self._store(key, copy)
+
+    def evict(self):
+        """
+        Scans the cache and, if it is over max_bytes, deletes least recently
+        used entries until it is down to EVICT_TO of that. Records the
+        resulting total as the new size estimate.
+        """
+        entries = []
+        total = 0
+        for sub in self.directory.glob("??"):
+            try:
+                with os.scandir(sub) as it:
+                    for entry in it:
+                        if entry.name.startswith(".tmp-"):
+                            continue
+                        try:
+                            st = entry.stat()
+                        except OSError:
+                            continue
+                        entries.append((st.st_mtime, st.st_size, entry.path))
+                        total += st.st_size
+            except OSError:
+                continue
+
+        if total > self.max_bytes:
+            target = self.max_bytes * EVICT_TO
+            entries.sort()
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                try:
+                    os.unlink(path)
+                except OSError:
+                    continue
+                total -= size
+
+        self._write_usage(total)
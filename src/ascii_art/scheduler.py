@@ -0,0 +1,76 @@
+# src/ascii_art/scheduler.py
+import time
+
+
+class PlaybackScheduler:
+    """
+    Presentation clock for video playback, keyed to time.monotonic().
+
+    Frame i is due at start + i / fps on the source's own timeline, so an
+    overrun on one frame never pushes later frames back. When playback falls
+    behind far enough that a frame's successor is already due, the frame
+    should be dropped instead of shown.
+    """
+
+    def __init__(self, fps, clock=time.monotonic, sleep=time.sleep):
+        self.fps = fps
+        self.frame_delay = 1.0 / fps
+        self._clock = clock
+        self._sleep = sleep
+
+        self.start_time = None
+        self.end_time = None
+        self.frames_shown = 0
+        self.frames_dropped = 0
+        self.total_lateness = 0.0
+
+    def start(self):
+        self.start_time = self._clock()
+
+    def stop(self):
+        if self.end_time is None:
+            self.end_time = self._clock()
+
+    def due(self, index):
+        """Monotonic time at which frame `index` should be presented."""
+        return self.start_time + index * self.frame_delay
+
+    def should_drop(self, index):
+        """True when the next frame is already due, i.e. `index` is too late."""
+        if self._clock() >= self.due(index + 1):
+            self.frames_dropped += 1
+            return True
+        return False
+
+    def wait(self, index):
+        """Sleeps until frame `index` is due and records how late it is."""
+        remaining = self.due(index) - self._clock()
+        if remaining > 0:
+            self._sleep(remaining)
+        self.total_lateness += max(0.0, self._clock() - self.due(index))
+        self.frames_shown += 1
+
+    def report(self):
+        """Summary of the playback so far as a dict."""
+        end = self.end_time if self.end_time is not None else self._clock()
+        elapsed = 0.0
+        if self.start_time is not None:
+            # The last frame shown still occupies one slot on the timeline
+            elapsed = end - self.start_time + self.frame_delay
+        shown = self.frames_shown
+        return {
+            "target_fps": self.fps,
+            "achieved_fps": shown / elapsed if elapsed > 0 else 0.0,
+            "frames_shown": shown,
+            "frames_dropped": self.frames_dropped,
+            "mean_lateness_ms": (self.total_lateness / shown * 1000) if shown else 0.0,
+            "elapsed_s": elapsed,
+        }
+
+    def format_report(self):
+        r = self.report()
+        return (
+            f"Playback: {r['achieved_fps']:.1f}/{r['target_fps']:.1f} fps, "
+            f"{r['frames_shown']} shown, {r['frames_dropped']} dropped, "
+            f"mean lateness {r['mean_lateness_ms']:.1f} ms"
+        )
@@ -1,42 +1,162 @@
 # src/ascii_art/server.py
+import gzip
+import hashlib
 import http.server
+import mimetypes
 import shutil
-import socketserver
 import subprocess
 import threading
 import time
 import webbrowser
+from pathlib import Path
 
 from .ui import cool_print
 
 # --- GLOBAL STATE ---
-SERVER_STATE = {"current_file": None, "is_running": False}
+# "artifact" is replaced as a whole (never mutated) so handler threads
+# always see a consistent body/ETag pair.
+SERVER_STATE = {"current_file": None, "artifact": None, "is_running": False}
 
+DEFAULT_PORT = 8000
+
+# Bodies smaller than this are not worth compressing
+GZIP_MIN_BYTES = 1024
+
+CONTENT_TYPES = {
+    ".html": "text/html; charset=utf-8",
+    ".txt": "text/plain; charset=utf-8",
+    ".cast": "application/x-asciicast",
+}
+
+
+class Artifact:
+    """
+    A file held in memory for serving: the raw body, a gzip variant (when
+    it is smaller), their ETags and the content type. Built once per file.
+    """
+
+    __slots__ = ("path", "body", "gzip_body", "etag", "gzip_etag", "content_type")
+
+    def __init__(self, path, body):
+        self.path = Path(path)
+        self.body = body
+
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        self.etag = f'"{digest}"'
+        # Each encoding is a different representation, so it gets its own ETag
+        self.gzip_etag = f'"{digest}-gz"'
+
+        self.gzip_body = None
+        if len(body) >= GZIP_MIN_BYTES:
+            compressed = gzip.compress(body, compresslevel=6, mtime=0)
+            if len(compressed) < len(body):
+                self.gzip_body = compressed
+
+        suffix = self.path.suffix.lower()
+        self.content_type = CONTENT_TYPES.get(suffix) or (
+            mimetypes.guess_type(self.path.name)[0] or "application/octet-stream"
+        )
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, "rb") as f:
+            return cls(path, f.read())
+
+
+def accepts_gzip(header):
+    """True if an Accept-Encoding header allows gzip (q=0 means refused)."""
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip().lower() not in ("gzip", "*"):
+            continue
+        q = params.strip().lower()
+        if q.startswith("q="):
+            try:
+                return float(q[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+def etag_matches(header, etags):
+    """Weak comparison of an If-None-Match header against our ETags."""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return any(tag in candidates for tag in etags)
+
+
+class DynamicFileHandler(http.server.BaseHTTPRequestHandler):
+    # Keep-alive; every response carries a Content-Length
+    protocol_version = "HTTP/1.1"
 
-class DynamicFileHandler(http.server.SimpleHTTPRequestHandler):
     def log_message(self, format, *args):
         # Silence server logs
         pass
 
-    def do_GET(self):
-        if self.path == "/" or self.path == "/myfile":
-            filepath = SERVER_STATE["current_file"]
+    def do_HEAD(self):
+        self._serve(send_body=False)
 
-            if not filepath:
-                self.send_error(404, "No file currently loaded.")
-                return
+    def do_GET(self):
+        self._serve(send_body=True)
 
-            try:
-                with open(filepath, "rb") as f:
-                    content = f.read()
-                self.send_response(200)
-                self.send_header("Content-type", "text/plain; charset=utf-8")
-                self.end_headers()
-                self.wfile.write(content)
-            except Exception as e:
-                self.send_error(404, f"File not found: {e}")
-        else:
+    def _serve(self, send_body):
+        if self.path not in ("/", "/myfile"):
             self.send_error(404, "Not Found")
+            return
+
+        artifact = SERVER_STATE["artifact"]
+        if artifact is None:
+            self.send_error(404, "No file currently loaded.")
+            return
+
+        use_gzip = artifact.gzip_body is not None and accepts_gzip(
+            self.headers.get("Accept-Encoding")
+        )
+        body = artifact.gzip_body if use_gzip else artifact.body
+        etag = artifact.gzip_etag if use_gzip else artifact.etag
+
+        if etag_matches(
+            self.headers.get("If-None-Match"), (artifact.etag, artifact.gzip_etag)
+        ):
+            self.send_response(304)
+            self._send_cache_headers(etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", artifact.content_type)
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self._send_cache_headers(etag)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _send_cache_headers(self, etag):
+        self.send_header("ETag", etag)
+        # The content behind the URL changes between renders: always revalidate
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+
+
+def set_current_file(filepath):
+    """Loads `filepath` into memory as the artifact being served."""
+    SERVER_STATE["artifact"] = Artifact.from_file(filepath)
+    SERVER_STATE["current_file"] = filepath
+
+
+def make_server(port, host="", handler=DynamicFileHandler):
+    """A threaded server so one slow client never blocks the others."""
+    http.server.ThreadingHTTPServer.allow_reuse_address = True
+    httpd = http.server.ThreadingHTTPServer((host, port), handler)
+    httpd.daemon_threads = True
+    return httpd
 
 
 def open_browser_silently(url):
@@ -64,9 +184,13 @@ def open_browser_silently(url):
 
 
 def start_server_and_open_browser(filepath):
-    PORT = 8000
+    PORT = DEFAULT_PORT
 
-    SERVER_STATE["current_file"] = filepath
+    try:
+        set_current_file(filepath)
+    except OSError as e:
+        print(f"❌ Error reading '{filepath}': {e}")
+        return
     url = f"http://localhost:{PORT}/myfile"
 
     # If server is already running, just open browser
@@ -78,9 +202,8 @@ def start_server_and_open_browser(filepath):
 
     # Start new server
     def run_server():
-        socketserver.TCPServer.allow_reuse_address = True
         try:
-            with socketserver.TCPServer(("", PORT), DynamicFileHandler) as httpd:
+            with make_server(PORT) as httpd:
                 SERVER_STATE["is_running"] = True
                 httpd.serve_forever()
         except OSError as e:
@@ -0,0 +1,128 @@
+# src/ascii_art/sink.py
+import os
+import re
+import select
+import sys
+import time
+
+try:
+    import termios
+    import tty
+except ImportError:  # Windows
+    termios = None
+
+HOME = b"\033[H"
+HIDE_CURSOR = b"\033[?25l"
+SHOW_CURSOR = b"\033[?25h"
+
+# DEC private mode 2026: the terminal holds off repainting between these,
+# so a frame is never shown half drawn.
+SYNC_BEGIN = b"\033[?2026h"
+SYNC_END = b"\033[?2026l"
+
+# DECRQM query for mode 2026 and its reply: 1 = set, 2 = reset (supported)
+SYNC_QUERY = b"\033[?2026$p"
+SYNC_REPLY = re.compile(rb"\033\[\?2026;(\d)\$y")
+
+# Seconds to wait for the terminal to answer SYNC_QUERY
+QUERY_TIMEOUT = 0.1
+
+
+def write_all(fd, data):
+    """os.write() until the whole buffer is out (ttys may write partially)."""
+    data = memoryview(data)
+    while data:
+        written = os.write(fd, data)
+        data = data[written:]
+
+
+def query_synchronized_output(fd, timeout=QUERY_TIMEOUT):
+    """
+    Asks the terminal on `fd` whether it supports synchronized output.
+    Needs a tty on both stdin and `fd`; terminals that do not answer
+    within `timeout` seconds count as unsupported.
+    """
+    if termios is None or not (os.isatty(fd) and sys.stdin.isatty()):
+        return False
+
+    in_fd = sys.stdin.fileno()
+    saved = termios.tcgetattr(in_fd)
+    reply = b""
+    try:
+        # No echo or line buffering, so the reply can be read and hidden
+        tty.setcbreak(in_fd, termios.TCSANOW)
+        write_all(fd, SYNC_QUERY)
+        deadline = time.monotonic() + timeout
+        while not reply.endswith(b"$y"):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([in_fd], [], [], remaining)[0]:
+                break
+            reply += os.read(in_fd, 64)
+    except OSError:
+        return False
+    finally:
+        termios.tcsetattr(in_fd, termios.TCSADRAIN, saved)
+
+    match = SYNC_REPLY.search(reply)
+    return match is not None and match.group(1) in (b"1", b"2")
+
+
+class FrameSink:
+    """
+    Writes each video frame to a file descriptor in a single system call,
+    bypassing sys.stdout's text layer. On terminals that support it, every
+    frame is wrapped in synchronized output so it appears all at once, and
+    the cursor is hidden until close().
+    """
+
+    def __init__(self, fd=None, synchronized=None, hide_cursor=True):
+        self.fd = sys.stdout.fileno() if fd is None else fd
+        is_tty = os.isatty(self.fd)
+        if synchronized is None:
+            synchronized = is_tty and query_synchronized_output(self.fd)
+        self.synchronized = synchronized
+        self.hide_cursor = hide_cursor and is_tty
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def start(self):
+        # Anything still buffered in sys.stdout must go out first
+        sys.stdout.flush()
+        if self.hide_cursor:
+            write_all(self.fd, HIDE_CURSOR)
+
+    def write_frame(self, *parts):
+        """
+        Writes the parts (str or bytes-like) of one frame. Strings are
+        encoded once; everything goes out in one writev() where available.
+        """
+        chunks = [SYNC_BEGIN] if self.synchronized else []
+        for part in parts:
+            chunks.append(part.encode("utf-8") if isinstance(part, str) else part)
+        if self.synchronized:
+            chunks.append(SYNC_END)
+
+        if not hasattr(os, "writev"):
+            write_all(self.fd, b"".join(chunks))
+            return
+
+        total = sum(len(chunk) for chunk in chunks)
+        written = os.writev(self.fd, chunks)
+        if written < total:
+            # Short write (a full tty buffer): send the rest in order
+            write_all(self.fd, memoryview(b"".join(chunks))[written:])
+
+    def close(self):
+        """Ends any half-written synchronized frame and restores the cursor."""
+        tail = (SYNC_END if self.synchronized else b"") + (
+            SHOW_CURSOR if self.hide_cursor else b""
+        )
+        if tail:
+            write_all(self.fd, tail)
+        self.hide_cursor = False
+        self.synchronized = False
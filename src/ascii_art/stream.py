@@ -0,0 +1,322 @@
+# src/ascii_art/stream.py
+import http.server
+import threading
+import time
+from collections import deque
+from importlib import resources
+
+import cv2
+
+from . import charset as charset_mod
+from . import converter, dither, profiling, server, writer
+from .prefetch import FramePrefetcher
+from .scheduler import PlaybackScheduler
+from .video_renderer import resolve_video_dimensions
+
+# Frames queued per viewer before the oldest are dropped
+CLIENT_BUFFER_FRAMES = 8
+
+# Seconds between keep-alive comments on an idle stream
+HEARTBEAT_SECONDS = 15.0
+
+# Seconds viewers get to drain their queue once the video ends
+END_GRACE_SECONDS = 2.0
+
+END_EVENT = b"event: end\ndata: \n\n"
+HEARTBEAT = b": keep-alive\n\n"
+
+
+def encode_event(kind, text, event_id):
+    """One SSE event; each line of `text` becomes a data: line."""
+    data = text.replace("\n", "\ndata: ")
+    return f"id: {event_id}\nevent: {kind}\ndata: {data}\n\n".encode("utf-8")
+
+
+class ClientBuffer:
+    """
+    Bounded queue of encoded events for one viewer. When a slow viewer
+    falls behind, the oldest events are dropped: every event is a full
+    frame, so the newest one is all a viewer needs.
+    """
+
+    def __init__(self, size=CLIENT_BUFFER_FRAMES):
+        self._events = deque(maxlen=size)
+        self._cond = threading.Condition()
+        self.closed = False
+        self.sent = 0
+        self.dropped = 0
+
+    def push(self, event):
+        with self._cond:
+            if len(self._events) == self._events.maxlen:
+                self.dropped += 1
+            self._events.append(event)
+            self._cond.notify()
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify()
+
+    def pop(self, timeout=None):
+        """
+        Next event, waiting up to `timeout` seconds. Returns None on timeout
+        and END_EVENT once closed and drained.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._events or self.closed, timeout)
+            if self._events:
+                self.sent += 1
+                return self._events.popleft()
+            return END_EVENT if self.closed else None
+
+
+class Broadcaster:
+    """
+    Fans frames out to every connected viewer. Each frame is encoded once
+    and the same bytes are queued for all clients, so adding viewers costs
+    a queue append each, not another render.
+    """
+
+    def __init__(self, buffer_frames=CLIENT_BUFFER_FRAMES):
+        self.buffer_frames = buffer_frames
+        self.published = 0
+        self.closed = False
+        self._clients = set()
+        self._latest = None
+        self._lock = threading.Lock()
+        self._joined = threading.Event()
+        # Totals of viewers that have already left
+        self._sent = 0
+        self._dropped = 0
+        self._viewers = 0
+
+    def subscribe(self):
+        client = ClientBuffer(self.buffer_frames)
+        with self._lock:
+            # Late joiners see the current frame straight away
+            if self._latest is not None:
+                client.push(self._latest)
+            if self.closed:
+                client.close()
+            self._clients.add(client)
+            self._viewers += 1
+        self._joined.set()
+        return client
+
+    def unsubscribe(self, client):
+        with self._lock:
+            if client in self._clients:
+                self._clients.remove(client)
+                self._sent += client.sent
+                self._dropped += client.dropped
+
+    def wait_for_viewer(self, timeout=None):
+        return self._joined.wait(timeout)
+
+    @property
+    def viewers(self):
+        with self._lock:
+            return len(self._clients)
+
+    def publish(self, kind, text):
+        """Encodes one frame ("text" or "html") and queues it for everyone."""
+        self.published += 1
+        event = encode_event(kind, text, self.published)
+        with self._lock:
+            self._latest = event
+            clients = list(self._clients)
+        for client in clients:
+            client.push(event)
+
+    def close(self):
+        """Ends the stream; viewers get an "end" event after their backlog."""
+        with self._lock:
+            self.closed = True
+            clients = list(self._clients)
+        for client in clients:
+            client.close()
+
+    def stats(self):
+        with self._lock:
+            active = list(self._clients)
+            return {
+                "frames_published": self.published,
+                "viewers": self._viewers,
+                "events_sent": self._sent + sum(c.sent for c in active),
+                "events_dropped": self._dropped + sum(c.dropped for c in active),
+            }
+
+
+class StreamHandler(http.server.BaseHTTPRequestHandler):
+    """Serves the viewer page at / and the event stream at /events."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        # Silence server logs
+        pass
+
+    def do_GET(self):
+        if self.path in ("/", "/index.html"):
+            self._send_viewer()
+        elif self.path == "/events":
+            self._send_events()
+        else:
+            self.send_error(404, "Not Found")
+
+    def _send_viewer(self):
+        body = self.server.viewer_html
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_events(self):
+        broadcaster = self.server.broadcaster
+        client = broadcaster.subscribe()
+        # No Content-Length: the stream ends when the connection closes
+        self.close_connection = True
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.wfile.flush()
+
+            while True:
+                event = client.pop(timeout=HEARTBEAT_SECONDS)
+                # A heartbeat also notices viewers that went away
+                self.wfile.write(HEARTBEAT if event is None else event)
+                self.wfile.flush()
+                if event is END_EVENT:
+                    break
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Viewer closed the tab
+        finally:
+            broadcaster.unsubscribe(client)
+
+
+def load_viewer():
+    return resources.files(__package__).joinpath("viewer.html").read_bytes()
+
+
+def make_stream_server(broadcaster, port, host=""):
+    httpd = server.make_server(port, host=host, handler=StreamHandler)
+    httpd.broadcaster = broadcaster
+    httpd.viewer_html = load_viewer()
+    return httpd
+
+
+def start_stream_server(broadcaster, port, host=""):
+    """Starts serving on a daemon thread. Returns the server."""
+    httpd = make_stream_server(broadcaster, port, host)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    return httpd
+
+
+def stream_video(filepath, args):
+    """
+    Streams a video to browsers over Server-Sent Events at its own frame
+    rate. Frames are rendered once and shared by every viewer; playback
+    starts when the first viewer connects.
+    """
+    cap = cv2.VideoCapture(str(filepath))
+    if not cap.isOpened():
+        print(f"❌ Error: Could not open video file '{filepath}'.")
+        return
+
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    if fps <= 0:
+        fps = 30.0  # Fallback
+
+    ret, first_frame = cap.read()
+    if not ret:
+        print("❌ Error: Video is empty or unreadable.")
+        return
+
+    try:
+        target_w, target_h = resolve_video_dimensions(first_frame, args)
+        chars = charset_mod.get_charset(args.charset)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+
+    gray_lut = converter.build_glyph_lut(chars)
+    ditherer = dither.make_ditherer(args.dither, len(chars))
+    kind = "html" if args.color else "text"
+
+    broadcaster = Broadcaster()
+    try:
+        httpd = start_stream_server(broadcaster, args.port)
+    except OSError as e:
+        print(f"❌ Error: Could not start server on port {args.port}: {e}")
+        return
+
+    url = f"http://localhost:{args.port}/"
+    print(f"Streaming {target_w}x{target_h} at {fps:.1f} fps on {url}")
+    print("Waiting for a viewer to connect (Ctrl+C to stop)...")
+
+    prefetcher = FramePrefetcher(cap, target_w, target_h, color=args.color)
+    scheduler = PlaybackScheduler(fps)
+    frame_index = -1
+
+    try:
+        # Poll so Ctrl+C is not held up by the wait
+        while not broadcaster.wait_for_viewer(timeout=0.5):
+            pass
+
+        prefetcher.start()
+        scheduler.start()
+
+        while True:
+            with profiling.sample("wait_decode"):
+                frame_out = prefetcher.read()
+            if frame_out is None:
+                break  # End of video
+
+            frame_index += 1
+            if scheduler.should_drop(frame_index):
+                continue
+
+            with profiling.sample("render"):
+                if args.color:
+                    ascii_frame = converter.array_to_frame(frame_out, chars, ditherer)
+                    text = "\n".join(writer.html_lines(ascii_frame))
+                else:
+                    gray = frame_out if ditherer is None else ditherer(frame_out)
+                    text = converter.gray_to_text(gray, gray_lut)[:-1]
+
+            with profiling.sample("sleep"):
+                scheduler.wait(frame_index)
+
+            with profiling.sample("publish"):
+                broadcaster.publish(kind, text)
+
+    except KeyboardInterrupt:
+        print("\nStopped.")
+    finally:
+        scheduler.stop()
+        prefetcher.stop()
+        cap.release()
+        broadcaster.close()
+
+    stats = broadcaster.stats()
+    if scheduler.start_time is not None:
+        print(
+            f"\n{scheduler.format_report()}, {stats['viewers']} viewer(s), "
+            f"{stats['events_dropped']} frames dropped for slow viewers"
+        )
+    profiling.note("playback", scheduler.report())
+    profiling.note("stream", stats)
+
+    # Give viewers a moment to receive the end event
+    deadline = time.monotonic() + END_GRACE_SECONDS
+    while broadcaster.viewers and time.monotonic() < deadline:
+        time.sleep(0.05)
+    httpd.shutdown()
+    httpd.server_close()
@@ -0,0 +1,230 @@
+# src/ascii_art/strips.py
+import math
+from contextlib import contextmanager
+from functools import partial
+
+import numpy as np
+from PIL import Image
+
+from . import converter, image_resize
+from .frame import AsciiFrame
+
+# Images above this many pixels go through the strip pipeline
+STRIP_MIN_PIXELS = 64 * 1024 * 1024
+
+# Source pixels held in memory per band (as RGBA-sized cells)
+STRIP_BUDGET_BYTES = 32 * 1024 * 1024
+
+# Bytes per pixel for the uncompressed raw modes that can be read band by band
+RAW_PIXEL_BYTES = {
+    "L": 1,
+    "P": 1,
+    "LA": 2,
+    "I;16": 2,
+    "I;16B": 2,
+    "RGB": 3,
+    "BGR": 3,
+    "RGBA": 4,
+    "RGBX": 4,
+    "BGRA": 4,
+    "BGRX": 4,
+}
+
+
+def _raw_tile(img):
+    """
+    Returns (offset, rawmode, stride, orientation) when the image is stored
+    as one uncompressed block (BMP, PPM/PGM, uncompressed TIFF), else None.
+    """
+    if len(img.tile) != 1:
+        return None
+    codec, extents, offset, args = img.tile[0]
+    if codec != "raw" or extents != (0, 0, *img.size):
+        return None
+
+    if isinstance(args, str):
+        args = (args,)
+    rawmode = args[0]
+    stride = args[1] if len(args) > 1 else 0
+    orientation = args[2] if len(args) > 2 else 1
+
+    if not stride:
+        pixel_bytes = RAW_PIXEL_BYTES.get(rawmode)
+        if pixel_bytes is None:
+            return None
+        stride = img.width * pixel_bytes
+    if stride < 0 or orientation not in (1, -1):
+        return None
+    return offset, rawmode, stride, orientation
+
+
+def can_stream(img):
+    """True when bands can be read without decoding the whole image."""
+    return img.fp is not None and _raw_tile(img) is not None
+
+
+def should_stream(img):
+    """True for huge images that can be read band by band from disk."""
+    return can_stream(img) and img.width * img.height > STRIP_MIN_PIXELS
+
+
+@contextmanager
+def lifted_pixel_limit():
+    """
+    Temporarily disables Pillow's decompression bomb check. Only for opening
+    images that are then read band by band (see can_stream).
+    """
+    limit = Image.MAX_IMAGE_PIXELS
+    Image.MAX_IMAGE_PIXELS = None
+    try:
+        yield
+    finally:
+        Image.MAX_IMAGE_PIXELS = limit
+
+
+def open_streamable(source):
+    """
+    Opens an image that is too large for Pillow's default pixel limit.
+    Raises ValueError unless it can be streamed with bounded memory.
+    """
+    with lifted_pixel_limit():
+        img = Image.open(source)
+    if not can_stream(img):
+        w, h = img.size
+        img.close()
+        raise ValueError(
+            f"Image is too large ({w}x{h}) to decode in one piece. "
+            "Gigapixel inputs must be uncompressed (TIFF, BMP or PPM)."
+        )
+    return img
+
+
+def open_image(source):
+    """
+    Image.open(), except that images past Pillow's pixel limit are still
+    accepted when they can be streamed (see open_streamable).
+    """
+    try:
+        return Image.open(source)
+    except Image.DecompressionBombError:
+        return open_streamable(source)
+
+
+def read_band(img, top, bottom):
+    """
+    Returns source rows [top, bottom) as a new image. Uncompressed files are
+    read straight from disk; anything else is decoded once and cropped.
+    """
+    raw = _raw_tile(img) if img.fp is not None else None
+    if raw is None:
+        return img.crop((0, top, img.width, bottom))
+
+    offset, rawmode, stride, orientation = raw
+    rows = bottom - top
+    # Bottom-up files (BMP) store the last image row first
+    first = top if orientation == 1 else img.height - bottom
+    img.fp.seek(offset + first * stride)
+    data = img.fp.read(rows * stride)
+    band = Image.frombytes(
+        img.mode, (img.width, rows), data, "raw", rawmode, stride, orientation
+    )
+    if img.mode == "P":
+        band.putpalette(img.getpalette())
+    return band
+
+
+def _prepare_band(band, color):
+    """Normalizes a band to RGB, or to one luminance band with color off."""
+    if band.mode != "RGB" and (color or band.mode != "L"):
+        band = band.convert("RGB")
+    if not color:
+        band = image_resize.luminance_image(band)
+    return band
+
+
+def _scale_rows(img, width, y0, y1, rows, color):
+    """Box-filters source rows [y0, y1) (fractional) into `rows` output rows."""
+    y1 = min(y1, img.height)
+    top, bottom = math.floor(y0), math.ceil(y1)
+    band = _prepare_band(read_band(img, top, bottom), color)
+    box = (0, y0 - top, img.width, y1 - top)
+    return np.asarray(band.resize((width, rows), Image.Resampling.BOX, box=box))
+
+
+def _scale_tall_row(img, width, y0, y1, max_rows, color):
+    """
+    One output row whose source rows exceed the band budget: averages
+    chunks of at most `max_rows` rows, weighted by their height.
+    """
+    acc = None
+    y = y0
+    while y < y1:
+        y_next = min(y1, math.floor(y) + max_rows)
+        part = _scale_rows(img, width, y, y_next, 1, color).astype(np.float32)
+        weighted = part * (y_next - y)
+        acc = weighted if acc is None else acc + weighted
+        y = y_next
+    return np.rint(acc / (y1 - y0)).astype(np.uint8)
+
+
+def iter_scaled_rows(img, width, height, color=True, budget=STRIP_BUDGET_BYTES):
+    """
+    Downsamples the image to (width, height) one horizontal band at a time.
+    Yields uint8 arrays of output rows, (k, width, 3) RGB or (k, width)
+    luminance with color off. Peak memory is one band of about `budget` bytes.
+    """
+    scale_y = img.height / height
+    max_rows = max(1, budget // (img.width * 4))
+    rows_per_band = max(1, int(max_rows // math.ceil(scale_y)))
+
+    for j0 in range(0, height, rows_per_band):
+        j1 = min(height, j0 + rows_per_band)
+        y0, y1 = j0 * scale_y, j1 * scale_y
+        if y1 - y0 <= max_rows:
+            yield _scale_rows(img, width, y0, y1, j1 - j0, color)
+        else:
+            yield _scale_tall_row(img, width, y0, y1, max_rows, color)
+
+
+def iter_ascii(
+    img, width, height, charset, color=True, budget=STRIP_BUDGET_BYTES, dither=None
+):
+    """
+    Converts band by band. Yields colored AsciiFrames, or lists of finished
+    grayscale row strings (the same output as converter.image_to_ascii).
+    Ordered dithering lines up across bands; error diffusion restarts at
+    each band.
+    """
+    lut = None if color else converter.build_glyph_lut(charset)
+    y0 = 0
+    for rows in iter_scaled_rows(img, width, height, color, budget):
+        band_dither = None
+        if dither is not None:
+            band_dither = partial(dither, y0=y0)
+        y0 += len(rows)
+
+        if color:
+            yield converter.array_to_frame(rows, charset, band_dither)
+        else:
+            gray = converter.luminance(rows)
+            if band_dither is not None:
+                gray = band_dither(gray)
+            text = converter.gray_to_text(gray, lut)
+            yield text.split("\n")[:-1]
+
+
+def join_bands(bands, charset, color=True):
+    """Reassembles the output of iter_ascii into one AsciiFrame / row list."""
+    if not color:
+        return [row for band in bands for row in band]
+    indices = np.concatenate([band.indices for band in bands])
+    colors = np.concatenate([band.colors for band in bands])
+    return AsciiFrame(indices, charset, colors=colors)
+
+
+def image_to_ascii(
+    img, width, height, charset, color=True, dither=None, budget=STRIP_BUDGET_BYTES
+):
+    """Whole-image conversion through the strip pipeline."""
+    bands = list(iter_ascii(img, width, height, charset, color, budget, dither))
+    return join_bands(bands, charset, color)
@@ -1,10 +1,12 @@
 # src/ascii_art/terminal.py
-import shutil
 import sys
 from pathlib import Path
 
 from . import charset as charset_mod
-from . import converter, image_loader, image_resize, ui, video_renderer, writer
+from . import profiling
+
+# Heavy modules (NumPy, PIL, OpenCV) are imported inside the branches that
+# need them so charset-only invocations start fast.
 
 VIDEO_EXTENSIONS = {".mp4", ".avi", ".mov", ".mkv", ".webm", ".flv", ".wmv"}
 
@@ -38,6 +40,10 @@ def run_terminal_pipeline(args):
         print("Error: Input file is required. Use -i/--input-file <path>")
         sys.exit(1)
 
+    if not 0 <= args.color_tolerance <= 255:
+        print("Error: --color-tolerance must be between 0 and 255.")
+        sys.exit(1)
+
     input_str = args.input_file
     is_url = input_str.startswith(("http://", "https://"))
 
@@ -54,28 +60,70 @@ def run_terminal_pipeline(args):
         if any(lower_url.endswith(ext) for ext in VIDEO_EXTENSIONS):
             is_video = True
 
-    # --- 3. VIDEO BRANCH ---
+    if args.stream and not is_video:
+        print("❌ Error: --stream is only supported for video files.")
+        sys.exit(1)
+
+    # --- 3. PRE-RENDERED VIDEO (.asv) ---
+    if not is_url and Path(input_str).suffix.lower() == ".asv":
+        if any([args.save, args.output_folder, args.output_file_name, args.html]):
+            print("❌ Error: .asv files are already rendered and cannot be saved.")
+            sys.exit(1)
+
+        from . import asv
+
+        asv.play(input_str, args)
+        return
+
+    # --- 3b. VIDEO BRANCH ---
     if is_video:
-        # Check for forbidden SAVE flags
-        has_save_flag = any(
-            [args.save, args.output_folder, args.output_file_name, args.html]
-        )
+        if args.html:
+            print("❌ Error: --html is not supported for video files.")
+            sys.exit(1)
 
-        if has_save_flag:
-            print("❌ Error: Saving output is not supported for video files.")
+        # Save flags export an asciicast recording instead of playing
+        has_save_flag = any([args.save, args.output_folder, args.output_file_name])
+        if has_save_flag and args.stream:
+            print("❌ Error: --stream cannot be combined with save flags.")
             sys.exit(1)
+        if args.stream:
+            from . import stream
+
+            stream.stream_video(input_str, args)
+            return
+        if has_save_flag:
+            from . import video_export
+
+            video_export.export_video(input_str, args)
+            return
+
+        # Delegate to video renderer (the only path that needs OpenCV)
+        from . import video_renderer
 
-        # Delegate to video renderer
         video_renderer.play_video(input_str, args)
         return
 
     # --- 4. IMAGE BRANCH (Existing Logic) ---
+    from . import (
+        ansi,
+        converter,
+        dither,
+        image_loader,
+        image_resize,
+        render_cache,
+        strips,
+        writer,
+    )
+
     img = None
     original_path_obj = None
 
     if is_url:
         # Load directly (image_loader handles download)
-        img = image_loader.load_image(args.input_file, preview=False)
+        with profiling.stage("load"):
+            img = image_loader.load_image(
+                args.input_file, preview=False, use_cache=not args.no_cache
+            )
         if not img:
             sys.exit(1)
 
@@ -91,7 +139,8 @@ def run_terminal_pipeline(args):
             sys.exit(1)
 
         original_path_obj = p
-        img = image_loader.load_image(p, preview=False)
+        with profiling.stage("load"):
+            img = image_loader.load_image(p, preview=False)
         if not img:
             sys.exit(1)
 
@@ -104,70 +153,119 @@ def run_terminal_pipeline(args):
             )
             sys.exit(1)
 
-    target_w, target_h = None, None
-
-    if args.width or args.height:
-        try:
-            target_w, target_h = image_resize.calculate_dimensions(
-                img, args.width, args.height, args.aspect_ratio
-            )
-        except ValueError as e:
-            print(f"Error: {e}")
-            sys.exit(1)
-
-    elif args.downsize:
-        try:
-            factor = float(args.downsize)
-            if factor <= 0:
-                raise ValueError
-            target_w = int(img.width / factor)
-            target_h = int(img.height / factor)
-        except ValueError:
-            print("Error: --downsize must be a positive number.")
-            sys.exit(1)
-
-    else:
-        target_w, target_h = image_resize.get_auto_terminal_dimensions(img)
-
-    # --- 6. RESIZE ---
-    img_resized = image_resize.resize_image(img, target_w, target_h)
+    try:
+        target_w, target_h = image_resize.resolve_dimensions(
+            img, args.width, args.height, args.aspect_ratio, args.downsize
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
 
-    # --- 7. DETERMINE CHARSET ---
+    # --- 6. DETERMINE CHARSET ---
     try:
         chars = charset_mod.get_charset(args.charset)
     except ValueError as e:
         print(f"Error: {e}")
         sys.exit(1)
 
-    # --- 8. CONVERSION ---
-    if args.color:
-        ascii_grid = converter.image_to_ascii_with_color(img_resized, chars)
-    else:
-        ascii_grid = converter.image_to_ascii(img_resized, chars)
+    ditherer = dither.make_ditherer(args.dither, len(chars))
+
+    # --- 7. RENDER CACHE LOOKUP ---
+    # Keyed on the input bytes plus every setting that affects the output
+    cache = None
+    source_digest = None
+    if not args.no_cache:
+        cache = render_cache.RenderCache()
+        source_digest = img.info.get("source_digest")
+        if source_digest is None:
+            with profiling.stage("hash"):
+                source_digest = render_cache.digest_file(original_path_obj)
+        params = render_cache.output_params(args, chars, target_w, target_h)
+
+    def cache_key(kind):
+        if cache is None:
+            return None
+        return render_cache.make_key(source_digest, kind, params)
+
+    # --- 8. RESIZE + CONVERSION (deferred until a cache miss needs it) ---
+    ascii_grid = None
+    # Huge images are read, scaled and converted one band at a time
+    streamed = strips.should_stream(img)
+
+    def convert():
+        nonlocal ascii_grid
+        if ascii_grid is None and streamed:
+            with profiling.stage("strips"):
+                ascii_grid = strips.image_to_ascii(
+                    img, target_w, target_h, chars, color=args.color, dither=ditherer
+                )
+        elif ascii_grid is None:
+            # Records its own "decode" and "resize" stages
+            img_resized = image_resize.scale_image(
+                img, target_w, target_h, color=args.color
+            )
+            with profiling.stage("convert"):
+                if args.color:
+                    ascii_grid = converter.image_to_ascii_with_color(
+                        img_resized, chars, ditherer
+                    )
+                else:
+                    ascii_grid = converter.image_to_ascii(img_resized, chars, ditherer)
+        return ascii_grid
 
     # --- 9. OUTPUT TO TERMINAL ---
-    for row in ascii_grid:
-        line_parts = []
-        for item in row:
-            if isinstance(item, tuple):
-                char, (r, g, b) = item
-                display_str = char + "."
-                colored_str = ui.get_ansi_colored_string(display_str, r, g, b)
-                line_parts.append(colored_str)
-            else:
-                char = item
-                line_parts.append(char + " ")
-
-        sys.stdout.write("".join(line_parts) + "\n")
+    terminal_key = cache_key("ansi" if args.color else "terminal")
+    with profiling.stage("cache_lookup"):
+        output = cache.get_text(terminal_key) if cache else None
+
+    def render(grid):
+        with profiling.stage("render"):
+            if args.color:
+                return ansi.frame_to_ansi(
+                    grid, tolerance=args.color_tolerance, depth=args.color_depth
+                )
+            # Grayscale rows arrive finished (padding included)
+            return "".join(row + "\n" for row in grid)
+
+    def write(text):
+        with profiling.stage("terminal_write"):
+            sys.stdout.write(text)
+            sys.stdout.flush()
+
+    if output is None:
+        if streamed:
+            # Print each band as soon as it is converted
+            # ("strips" includes the nested render/terminal_write stages)
+            bands, chunks = [], []
+            with profiling.stage("strips"):
+                for band in strips.iter_ascii(
+                    img, target_w, target_h, chars, color=args.color, dither=ditherer
+                ):
+                    chunk = render(band)
+                    write(chunk)
+                    bands.append(band)
+                    chunks.append(chunk)
+            ascii_grid = strips.join_bands(bands, chars, color=args.color)
+            output = "".join(chunks)
+        else:
+            output = render(convert())
+            write(output)
+        if cache:
+            with profiling.stage("cache_store"):
+                cache.put_text(terminal_key, output)
+    else:
+        write(output)
 
     # --- 10. SAVE TO FILE (Optional) ---
     should_save = any([args.save, args.output_folder, args.output_file_name, args.html])
 
     if should_save:
         writer.save_art(
-            ascii_grid,
+            convert,
             original_filename=original_path_obj,
             output_folder=args.output_folder,
             output_name=args.output_file_name,
             as_html=args.html,
+            cache=cache,
+            cache_key=cache_key("html" if args.html else "txt"),
         )
@@ -1,8 +1,12 @@
 # src/ascii_art/url_image_loader.py
+import hashlib
+import json
 import os
+import time
 import urllib.error
 import urllib.request
 from io import BytesIO
+from pathlib import Path
 from urllib.parse import unquote, urlparse
 
 # --- SECURITY CONFIG ---
@@ -22,13 +26,123 @@ ALLOWED_MIME_TYPES = {
 }
 
 
-def download_image(url):
+# --- URL CACHE CONFIG ---
+URL_CACHE_DIR = Path(
+    os.environ.get("ASCIIFY_URL_CACHE_DIR", Path.home() / ".cache" / "asciify" / "urls")
+)
+
+
+def _cache_paths(url):
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return URL_CACHE_DIR / f"{key}.bin", URL_CACHE_DIR / f"{key}.json"
+
+
+def _parse_cache_control(header):
+    """Returns (max_age seconds or None, no_store flag)."""
+    max_age = None
+    no_store = False
+    for directive in (header or "").split(","):
+        name, _, value = directive.strip().partition("=")
+        name = name.lower()
+        if name == "no-store":
+            no_store = True
+        elif name == "no-cache":
+            max_age = 0
+        elif name == "max-age" and max_age is None:
+            try:
+                max_age = max(0, int(value.strip('"')))
+            except ValueError:
+                max_age = 0
+    return max_age, no_store
+
+
+def _load_cached(url):
+    """Returns (metadata dict, bytes) for a cached URL, or (None, None)."""
+    data_path, meta_path = _cache_paths(url)
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        if meta.get("url") != url:
+            return None, None
+        data = data_path.read_bytes()
+    except (OSError, ValueError):
+        return None, None
+    if len(data) > MAX_DOWNLOAD_SIZE:
+        return None, None
+    return meta, data
+
+
+def _store_cached(url, meta, data=None):
+    """Writes metadata (and the body, when given). Caching is best-effort."""
+    data_path, meta_path = _cache_paths(url)
+    try:
+        URL_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        if data is not None:
+            tmp = data_path.with_suffix(".bin.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, data_path)
+        tmp = meta_path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(tmp, meta_path)
+    except OSError:
+        pass
+
+
+def _drop_cached(url):
+    """Forgets a cached URL, e.g. once the server says not to store it."""
+    for path in _cache_paths(url):
+        try:
+            path.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+
+def _freshness(headers):
+    """Cache metadata derived from a response's caching headers."""
+    max_age, no_store = _parse_cache_control(headers.get("Cache-Control"))
+    return {
+        "fetched_at": time.time(),
+        "max_age": max_age,
+        "no_store": no_store,
+    }
+
+
+def _is_fresh(meta):
+    max_age = meta.get("max_age")
+    if not max_age:
+        return False
+    return time.time() - meta.get("fetched_at", 0) < max_age
+
+
+def _filename_for(parsed_url, content_type):
+    """Picks a filename from the URL path, else guesses one from Content-Type."""
+    # Unquote handles %20 spaces and other encoding
+    path_path = unquote(parsed_url.path)
+    filename = os.path.basename(path_path)
+
+    # Sanity check: If filename is empty or has no extension, fallback
+    if not filename or "." not in filename:
+        # Try to guess extension from content-type
+        ext = ".jpg"  # default
+        if content_type == "image/png":
+            ext = ".png"
+        elif content_type == "image/webp":
+            ext = ".webp"
+        elif content_type == "image/gif":
+            ext = ".gif"
+
+        filename = f"downloaded_image{ext}"
+
+    return filename
+
+
+def download_image(url, use_cache=True):
     """
     Downloads image to memory with strict safety checks.
+    Responses are kept in a local URL cache: a fresh entry (Cache-Control
+    max-age) is reused without touching the network, a stale one is
+    revalidated with If-None-Match / If-Modified-Since and reused on 304.
     Returns: (BytesIO object, filename_string) or (None, None)
     """
-    print(f"Downloading from URL: {url} ...")
-
     # 1. Validate Scheme (Protocol)
     try:
         parsed_url = urlparse(url)
@@ -40,11 +154,25 @@ def download_image(url):
         print("❌ Error: URL must start with http:// or https://")
         return None, None
 
-    try:
-        # 2. Setup Request with User-Agent
-        req = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    # 2. Local Cache (fresh entries skip the network entirely)
+    meta, cached = _load_cached(url) if use_cache else (None, None)
+    if meta and _is_fresh(meta):
+        print(f"Using cached copy of: {url}")
+        return BytesIO(cached), meta["filename"]
+
+    print(f"Downloading from URL: {url} ...")
 
-        # 3. Open Connection (Headers only first)
+    try:
+        # 3. Setup Request with User-Agent (+ validators for revalidation)
+        headers = {"User-Agent": USER_AGENT}
+        if meta:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        req = urllib.request.Request(url, headers=headers)
+
+        # 4. Open Connection (Headers only first)
         with urllib.request.urlopen(req, timeout=TIMEOUT_SECONDS) as response:
 
             # --- SECURITY CHECK: Content-Length ---
@@ -70,7 +198,7 @@ def download_image(url):
                     )
                     return None, None
 
-            # 4. Stream Download (Prevent Memory Exhaustion)
+            # 5. Stream Download (Prevent Memory Exhaustion)
             img_data = BytesIO()
             bytes_downloaded = 0
             chunk_size = 8192
@@ -87,27 +215,34 @@ def download_image(url):
 
             img_data.seek(0)
 
-            # 5. Determine Filename (Robust Extraction)
-            # Unquote handles %20 spaces and other encoding
-            path_path = unquote(parsed_url.path)
-            filename = os.path.basename(path_path)
-
-            # Sanity check: If filename is empty or has no extension, fallback
-            if not filename or "." not in filename:
-                # Try to guess extension from content-type
-                ext = ".jpg"  # default
-                if content_type == "image/png":
-                    ext = ".png"
-                elif content_type == "image/webp":
-                    ext = ".webp"
-                elif content_type == "image/gif":
-                    ext = ".gif"
-
-                filename = f"downloaded_image{ext}"
+            # 6. Determine Filename (Robust Extraction)
+            filename = _filename_for(parsed_url, content_type)
+
+            # 7. Remember the body and its validators for next time
+            new_meta = _freshness(response.headers)
+            if use_cache and not new_meta["no_store"]:
+                new_meta.update(
+                    url=url,
+                    filename=filename,
+                    etag=response.getheader("ETag"),
+                    last_modified=response.getheader("Last-Modified"),
+                )
+                _store_cached(url, new_meta, img_data.getvalue())
+            elif use_cache:
+                _drop_cached(url)
 
             return img_data, filename
 
     except urllib.error.HTTPError as e:
+        if e.code == 304 and meta:
+            # Not Modified: the cached body is still current
+            meta.update(_freshness(e.headers))
+            if not meta["no_store"]:
+                _store_cached(url, meta)
+            else:
+                _drop_cached(url)
+            print("Not modified, using cached copy.")
+            return BytesIO(cached), meta["filename"]
         print(f"❌ HTTP Error: {e.code} {e.reason}")
     except urllib.error.URLError as e:
         print(f"❌ Network Error: {e.reason}")
@@ -0,0 +1,211 @@
+# src/ascii_art/video_export.py
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import cv2
+
+from . import ansi, asv
+from . import charset as charset_mod
+from . import converter, dither, writer
+from .prefetch import FramePrefetcher, process_frame
+from .video_renderer import resolve_video_dimensions
+
+# Frames handed to a worker at once (amortizes pickling and IPC)
+CHUNK_FRAMES = 16
+
+# Chunks in flight per worker; bounds memory on long videos
+CHUNKS_PER_WORKER = 3
+
+CLEAR_SCREEN = "\033[2J\033[H"
+HOME = "\033[H"
+
+
+class CastWriter:
+    """Writes frames as output events of an asciicast v2 recording."""
+
+    # asciinema records what a pty emits, where "\n" has become "\r\n"
+    newline = "\r\n"
+
+    def __init__(self, path, columns, rows, fps, title=None):
+        self.fps = fps
+        self.frame_count = 0
+        self._f = open(path, "w", encoding="utf-8")
+        header = {
+            "version": 2,
+            "width": columns,
+            "height": rows,
+            "timestamp": int(time.time()),
+            "env": {"TERM": "xterm-256color"},
+        }
+        if title:
+            header["title"] = title
+        self._f.write(json.dumps(header) + "\n")
+        self._f.write(json.dumps([0.0, "o", CLEAR_SCREEN]) + "\n")
+
+    def add(self, data, keyframe=False):
+        # Unchanged frames produce no output but still take a time slot
+        if data:
+            event = [round(self.frame_count / self.fps, 6), "o", data]
+            self._f.write(json.dumps(event, ensure_ascii=False) + "\n")
+        self.frame_count += 1
+
+    def close(self):
+        self._f.close()
+
+
+class AsvWriter(asv.AsvWriter):
+    """asv.AsvWriter for the export loop (the player writes to a real tty)."""
+
+    newline = "\n"
+
+
+def render_chunk(frames, chars, args, newline="\n"):
+    """
+    Renders a run of consecutive frames to terminal output. Runs inside a
+    worker process. The first frame of a chunk is always a full repaint;
+    later ones are deltas against their predecessor unless --no-delta.
+    Returns: list of (data, is_full_repaint) with `newline` line endings.
+    """
+    delta = None
+    if not args.no_delta:
+        delta = ansi.DeltaRenderer(
+            pad="." if args.color else converter.GRAY_PAD,
+            tolerance=args.color_tolerance,
+            depth=args.color_depth,
+        )
+    gray_lut = None if args.color else converter.build_glyph_lut(chars)
+    ditherer = dither.make_ditherer(args.dither, len(chars))
+
+    out = []
+    for pixels in frames:
+        if ditherer is not None and not args.color:
+            pixels = ditherer(pixels)
+        ascii_frame = converter.array_to_frame(
+            pixels, chars, ditherer if args.color else None
+        )
+        data = delta.diff(ascii_frame) if delta else None
+        keyframe = data is None
+        if keyframe:
+            # Full repaint; drop the final newline so the frame does not scroll
+            if args.color:
+                text = ansi.frame_to_ansi(
+                    ascii_frame, tolerance=args.color_tolerance, depth=args.color_depth
+                )
+                data = HOME + text[: -len(ansi.RESET) - 1] + ansi.RESET
+            else:
+                data = HOME + converter.gray_to_text(pixels, gray_lut)[:-1]
+        if newline != "\n":
+            data = data.replace("\n", newline)
+        out.append((data, keyframe))
+    return out
+
+
+def _chunks(prefetcher, first, size):
+    """Groups decoded frames into lists of `size`, starting with `first`."""
+    chunk = [first]
+    while True:
+        frame = prefetcher.read()
+        if frame is None:
+            break
+        chunk.append(frame)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def export_video(filepath, args):
+    """
+    Converts every frame of a video as fast as the machine allows and writes
+    an asciicast v2 (.cast) recording or an ASV container (--export-format).
+    Frames are decoded in order on a thread, rendered in chunks by a process
+    pool and written back in order, each stamped with its time on the source
+    timeline (index / fps).
+    """
+    cap = cv2.VideoCapture(str(filepath))
+    if not cap.isOpened():
+        print(f"❌ Error: Could not open video file '{filepath}'.")
+        sys.exit(1)
+
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    if fps <= 0:
+        fps = 30.0  # Fallback
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) or None
+
+    ret, first_frame = cap.read()
+    if not ret:
+        print("❌ Error: Video is empty or unreadable.")
+        sys.exit(1)
+
+    try:
+        target_w, target_h = resolve_video_dimensions(first_frame, args)
+        chars = charset_mod.get_charset(args.charset)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    output_path = writer.resolve_output_path(
+        filepath, args.output_folder, args.output_file_name, f".{args.export_format}"
+    )
+    if output_path is None:
+        sys.exit(1)
+
+    jobs = args.jobs or os.cpu_count() or 1
+    size = (target_w, target_h)
+    first = process_frame(first_frame, size, args.color)
+
+    label = f"{total} frames" if total else "frames"
+    print(f"Exporting {label} ({target_w}x{target_h}) with {jobs} workers...")
+    start = time.perf_counter()
+
+    # Every glyph is followed by one padding column
+    size_args = dict(columns=target_w * 2, rows=target_h, fps=fps)
+    if args.export_format == "cast":
+        out = CastWriter(output_path, title=Path(str(filepath)).name, **size_args)
+    else:
+        # The ASV header has no room for a title
+        out = AsvWriter(output_path, **size_args)
+    pending = deque()
+    max_pending = jobs * CHUNKS_PER_WORKER
+
+    def flush(rendered):
+        for data, keyframe in rendered:
+            out.add(data, keyframe=keyframe)
+
+    try:
+        with (
+            FramePrefetcher(cap, target_w, target_h, color=args.color) as prefetcher,
+            ProcessPoolExecutor(max_workers=jobs) as pool,
+        ):
+            for chunk in _chunks(prefetcher, first, CHUNK_FRAMES):
+                pending.append(
+                    pool.submit(render_chunk, chunk, chars, args, out.newline)
+                )
+                # Write finished chunks in submission order to keep frame order
+                while pending and (len(pending) >= max_pending or pending[0].done()):
+                    flush(pending.popleft().result())
+
+            while pending:
+                flush(pending.popleft().result())
+    except KeyboardInterrupt:
+        print("\nStopped. Partial recording kept.")
+    finally:
+        out.close()
+        cap.release()
+
+    elapsed = time.perf_counter() - start
+    index = out.frame_count
+    duration = index / fps
+    speed = duration / elapsed if elapsed > 0 else 0.0
+    print(
+        f"✅ Output saved to: {output_path}\n"
+        f"{index} frames ({duration:.1f}s of video) in {elapsed:.2f}s "
+        f"({speed:.1f}x real time)."
+    )
+    return output_path
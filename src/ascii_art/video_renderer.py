@@ -1,6 +1,4 @@
 # src/ascii_art/video_renderer.py
-import sys
-import time
 from pathlib import Path
 
 import cv2
@@ -8,7 +6,10 @@ import numpy as np
 from PIL import Image
 
 from . import charset as charset_mod
-from . import image_resize, ui
+from . import ansi, converter, dither, image_resize, profiling, ui
+from .prefetch import FramePrefetcher
+from .scheduler import PlaybackScheduler
+from .sink import HOME, FrameSink
 
 # Import Rust renderer
 try:
@@ -17,6 +18,27 @@ except ImportError:
     render_frame_to_string = None
 
 
+def resolve_video_dimensions(first_frame, args):
+    """
+    Output grid size for a video from the dimension flags and its first
+    (BGR) frame. Raises ValueError with a user-facing message.
+    """
+    first_frame_rgb = cv2.cvtColor(first_frame, cv2.COLOR_BGR2RGB)
+    pil_img = Image.fromarray(first_frame_rgb)
+
+    if args.width or args.height:
+        return image_resize.calculate_dimensions(
+            pil_img, args.width, args.height, args.aspect_ratio
+        )
+    if args.downsize:
+        try:
+            factor = float(args.downsize)
+            return int(pil_img.width / factor), int(pil_img.height / factor)
+        except (ValueError, ZeroDivisionError):
+            raise ValueError("--downsize must be a positive number.")
+    return image_resize.get_auto_terminal_dimensions(pil_img)
+
+
 def play_video(filepath, args):
     """
     Plays a video file as ASCII art in the terminal.
@@ -31,7 +53,6 @@ def play_video(filepath, args):
     fps = cap.get(cv2.CAP_PROP_FPS)
     if fps <= 0:
         fps = 30.0  # Fallback
-    frame_delay = 1.0 / fps
 
     # 3. Setup Logic (Dimensions & Charset)
     ret, first_frame = cap.read()
@@ -39,29 +60,12 @@ def play_video(filepath, args):
         print("❌ Error: Video is empty or unreadable.")
         return
 
-    first_frame_rgb = cv2.cvtColor(first_frame, cv2.COLOR_BGR2RGB)
-    pil_img = Image.fromarray(first_frame_rgb)
-
     # Determine Dimensions
-    target_w, target_h = None, None
-    if args.width or args.height:
-        try:
-            target_w, target_h = image_resize.calculate_dimensions(
-                pil_img, args.width, args.height, args.aspect_ratio
-            )
-        except ValueError as e:
-            print(f"Error: {e}")
-            return
-    elif args.downsize:
-        try:
-            factor = float(args.downsize)
-            target_w = int(pil_img.width / factor)
-            target_h = int(pil_img.height / factor)
-        except ValueError:
-            print("Error: --downsize must be a positive number.")
-            return
-    else:
-        target_w, target_h = image_resize.get_auto_terminal_dimensions(pil_img)
+    try:
+        target_w, target_h = resolve_video_dimensions(first_frame, args)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
 
     # Determine Charset
     try:
@@ -72,64 +76,117 @@ def play_video(filepath, args):
         print(f"Error: {e}")
         return
 
-    # Check for Rust support
-    if args.color and render_frame_to_string is None:
-        print("❌ Error: Rust extension not found. Build with 'maturin develop'.")
-        return
+    # Grayscale frames render into one reused buffer (native when built)
+    gray_renderer = converter.GrayRenderer(chars_str)
+
+    # Optional dithering of each frame's luminance (None when off)
+    ditherer = dither.make_ditherer(args.dither, len(chars_str))
+
+    # Differential renderer: only changed cells are redrawn between frames
+    delta = None
+    if not args.no_delta:
+        delta = ansi.DeltaRenderer(
+            pad="." if args.color else converter.GRAY_PAD,
+            tolerance=args.color_tolerance,
+            depth=args.color_depth,
+        )
+
+    # Decode + resize on a worker thread so decode stalls overlap rendering
+    prefetcher = FramePrefetcher(cap, target_w, target_h, color=args.color)
+
+    # Build the palette lookup cube before the clock starts
+    if args.color and args.color_depth != 24:
+        ansi.palette_lut(args.color_depth)
 
     # Clear screen ONCE before starting
     ui.clear_terminal()
 
+    # One write per frame, synchronized and with the cursor hidden on ttys
+    sink = FrameSink()
+
+    # Presentation clock: frame i is due at start + i / fps
+    scheduler = PlaybackScheduler(fps)
+    frame_index = -1
+
     try:
-        while True:
-            start_time = time.time()
+        prefetcher.start()
+        sink.start()
+        scheduler.start()
 
-            ret, frame = cap.read()
-            if not ret:
+        while True:
+            # Already resized (OpenCV INTER_AREA) and converted on the worker:
+            # RGB for color, single-channel max(B, G, R) for grayscale.
+            with profiling.sample("wait_decode"):
+                frame_out = prefetcher.read()
+            if frame_out is None:
                 break  # End of video
 
-            # Resize Frame (OpenCV is faster than PIL here, stay in CV2/NumPy land)
-            # OpenCV expects (width, height)
-            frame_resized = cv2.resize(
-                frame, (target_w, target_h), interpolation=cv2.INTER_AREA
-            )
-
-            # Convert BGR (OpenCV) to RGB (Standard)
-            # We pass this numpy array directly to Rust
-            frame_rgb = cv2.cvtColor(frame_resized, cv2.COLOR_BGR2RGB)
+            # Skip frames we can no longer show on time to stay in sync
+            frame_index += 1
+            if scheduler.should_drop(frame_index):
+                continue
+
+            # BUILD FRAME (glyph indices + optional colors)
+            with profiling.sample("build"):
+                if args.color:
+                    # We pass this numpy array directly to Rust
+                    frame_rgb = frame_out
+                    ascii_frame = converter.array_to_frame(
+                        frame_rgb, chars_str, ditherer
+                    )
+                else:
+                    gray = frame_out if ditherer is None else ditherer(frame_out)
+                    ascii_frame = converter.array_to_frame(gray, chars_str)
 
             # RENDER FRAME
-            ui.move_cursor_home()
-
-            if args.color:
-                # --- NEW RUST PATH ---
-                # Returns one giant string with all ANSI codes
-                output_str = render_frame_to_string(frame_rgb, chars_list)
-                sys.stdout.write(output_str)
-            else:
-                # --- LEGACY GRAYSCALE PATH (Keep Python/NumPy) ---
-                # Since we optimized COLOR, let's rely on the old converter for grayscale
-                pil_frame = Image.fromarray(frame_rgb)
-                from . import converter
-
-                ascii_grid = converter.image_to_ascii(pil_frame, chars_str)
-
-                output_buffer = []
-                for row in ascii_grid:
-                    # Grayscale aspect ratio fix
-                    row_parts = [char + " " for char in row]
-                    output_buffer.append("".join(row_parts))
-                sys.stdout.write("\n".join(output_buffer))
-
-            sys.stdout.flush()
-
-            # TIMING CONTROL
-            process_time = time.time() - start_time
-            sleep_time = max(0, frame_delay - process_time)
-            time.sleep(sleep_time)
+            with profiling.sample("render"):
+                # Try a delta against what is on screen first
+                output_str = delta.diff(ascii_frame) if delta else None
+
+                full_repaint = output_str is None
+                if full_repaint:
+                    if args.color:
+                        # --- COLOR PATH (Rust for TrueColor, Python otherwise) ---
+                        # (it picks glyphs itself, so not when dithering)
+                        if (
+                            render_frame_to_string is not None
+                            and args.color_depth == 24
+                            and ditherer is None
+                        ):
+                            # Returns one giant string with all ANSI codes
+                            output_str = render_frame_to_string(
+                                frame_rgb, chars_list, args.color_tolerance
+                            )
+                        else:
+                            output_str = ansi.frame_to_ansi(
+                                ascii_frame,
+                                tolerance=args.color_tolerance,
+                                depth=args.color_depth,
+                            )
+                    else:
+                        # --- GRAYSCALE PATH (bytes, no final newline) ---
+                        output_str = gray_renderer.render(gray)
+
+            # TIMING CONTROL: present at the frame's slot on the timeline
+            with profiling.sample("sleep"):
+                scheduler.wait(frame_index)
+
+            with profiling.sample("write"):
+                if full_repaint:
+                    # Full repaint from the top-left corner
+                    sink.write_frame(HOME, output_str)
+                else:
+                    sink.write_frame(output_str)
 
     except KeyboardInterrupt:
         ui.clear_terminal()
         print("\nStopped.")
     finally:
+        sink.close()
+        scheduler.stop()
+        prefetcher.stop()
         cap.release()
+
+    print(f"\n{scheduler.format_report()}, {prefetcher.consumer_stalls} decode stalls")
+    profiling.note("playback", scheduler.report())
+    profiling.note("prefetch", prefetcher.stats())
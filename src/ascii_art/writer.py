@@ -1,10 +1,18 @@
 # src/ascii_art/writer.py
 import html
+import io
 import os
 import re
+import shutil
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
+
+from . import profiling
+from .converter import GRAY_PAD
+from .frame import AsciiFrame
+
 
 def clean_filename(name):
     """Sanitizes a string to be safe for filenames."""
@@ -14,47 +22,104 @@ def clean_filename(name):
     return cleaned
 
 
-def generate_html(ascii_grid):
-    """Generates an HTML string from the ASCII grid."""
-    lines = []
-    lines.append("<!DOCTYPE html>")
-    lines.append("<html><head><style>")
-    lines.append(
-        "body { background-color: #000; color: #fff; font-family: monospace; white-space: pre; line-height: 1.0; }"
-    )
-    lines.append("</style></head><body>")
-
-    for row in ascii_grid:
-        line_html = ""
-        for item in row:
-            if isinstance(item, tuple):
-                char, (r, g, b) = item
-                # Escape the char for HTML (<, >, &)
-                safe_char = html.escape(char)
-                line_html += f'<span style="color: rgb({r},{g},{b})">{safe_char}</span>'
-            else:
-                safe_char = html.escape(item)
-                line_html += safe_char
-        lines.append(line_html)
+# Colored HTML uses one CSS class per color quantized to 4 bits per channel
+# (at most 4096 classes), named after its hex digits: .c1af -> #11aaff.
+HTML_COLOR_SHIFT = 4
 
-    lines.append("</body></html>")
-    return "\n".join(lines)
+HTML_BODY_STYLE = "body { background-color: #000; color: #fff; font-family: monospace; white-space: pre; line-height: 1.0; }"
 
 
-def save_art(
-    ascii_grid, original_filename, output_folder=None, output_name=None, as_html=False
-):
+def _html_color_codes(colors):
+    """Maps (H, W, 3) RGB to 12-bit palette codes (r, g, b nibbles)."""
+    q = (colors >> HTML_COLOR_SHIFT).astype(np.uint16)
+    return (q[..., 0] << 8) | (q[..., 1] << 4) | q[..., 2]
+
+
+def _css_palette(codes):
+    """One CSS rule per palette code used in the frame."""
+    rules = []
+    for code in np.unique(codes).tolist():
+        r, g, b = (code >> 8) & 0xF, (code >> 4) & 0xF, code & 0xF
+        # Nibble n expands to nn, spanning the full 0-255 range
+        rules.append(f".c{code:03x} {{ color: #{r:x}{r:x}{g:x}{g:x}{b:x}{b:x}; }}")
+    return rules
+
+
+def _frame_html_rows(frame, codes=None):
     """
-    Saves the ASCII art to a file.
+    Yields one HTML line per row of an AsciiFrame. With palette codes,
+    adjacent cells of the same color share a single <span>.
+    """
+    rows = frame.rows(pad="")
+    if codes is None:
+        for row in rows:
+            yield html.escape(row)
+        return
+
+    width = frame.width
+    for row, code_row in zip(rows, codes):
+        starts = np.flatnonzero(np.diff(code_row, prepend=-1) != 0).tolist()
+        ends = starts[1:] + [width]
+        run_codes = code_row[starts].tolist()
+        yield "".join(
+            f'<span class="c{code:03x}">{html.escape(row[start:end])}</span>'
+            for code, start, end in zip(run_codes, starts, ends)
+        )
+
+
+def html_lines(ascii_grid, codes=None):
+    """
+    Yields the HTML body line of each row of an AsciiFrame or a list of
+    padded row strings (converter.image_to_ascii). Glyphs are written
+    without the terminal padding; colored cells use the 12-bit palette
+    classes (.c1af).
+    """
+    if not isinstance(ascii_grid, AsciiFrame):
+        # Every glyph is followed by GRAY_PAD: keep only the glyphs
+        step = 1 + len(GRAY_PAD)
+        return (html.escape(row[::step]) for row in ascii_grid)
+    if codes is None and ascii_grid.has_color:
+        codes = _html_color_codes(ascii_grid.colors)
+    return _frame_html_rows(ascii_grid, codes)
 
-    Args:
-        ascii_grid: The 2D list of chars or (char, rgb) tuples.
-        original_filename: Path to the input image (used for auto-naming).
-        output_folder: Directory to save in (defaults to CWD).
-        output_name: Specific filename (WITHOUT extension).
-        as_html: Boolean to save as .html instead of .txt.
+
+def write_html(ascii_grid, f):
+    """
+    Streams an HTML document for an AsciiFrame or a list of row strings
+    straight to the text file handle `f`, one row at a time.
     """
+    codes = None
+    if isinstance(ascii_grid, AsciiFrame) and ascii_grid.has_color:
+        codes = _html_color_codes(ascii_grid.colors)
+
+    f.write("<!DOCTYPE html>\n")
+    f.write("<html><head><style>\n")
+    f.write(HTML_BODY_STYLE + "\n")
+    if codes is not None:
+        for rule in _css_palette(codes):
+            f.write(rule + "\n")
+    f.write("</style></head><body>\n")
+
+    for line in html_lines(ascii_grid, codes):
+        f.write(line)
+        f.write("\n")
+
+    f.write("</body></html>")
+
 
+def generate_html(ascii_grid):
+    """Generates an HTML string from an AsciiFrame or a list of row strings."""
+    buf = io.StringIO()
+    write_html(ascii_grid, buf)
+    return buf.getvalue()
+
+
+def resolve_output_path(original_filename, output_folder, output_name, extension):
+    """
+    Picks where an output file goes: `output_folder` (created if missing) or
+    the CWD, named `output_name` + extension or auto-named after the input
+    with a timestamp. Prints the problem and returns None on invalid input.
+    """
     # 1. Determine Output Directory
     if output_folder:
         target_dir = Path(output_folder)
@@ -70,7 +135,6 @@ def save_art(
 
     # 2. Determine File Name
     timestamp = datetime.now().strftime("%d%m%Y-%H%M%S")
-    extension = ".html" if as_html else ".txt"
 
     if output_name:
         # Check for user-provided extension
@@ -88,25 +152,75 @@ def save_art(
         base_name = clean_filename(Path(original_filename).name)
         final_filename = f"ascii_{base_name}_{timestamp}{extension}"
 
-    filepath = target_dir / final_filename
+    return target_dir / final_filename
+
 
-    # 3. Write File
+def save_art(
+    ascii_grid,
+    original_filename,
+    output_folder=None,
+    output_name=None,
+    as_html=False,
+    cache=None,
+    cache_key=None,
+):
+    """
+    Saves the ASCII art to a file.
+
+    Args:
+        ascii_grid: An AsciiFrame, a list of finished row strings, or a
+            zero-argument callable returning either (called only when the
+            render cache misses).
+        original_filename: Path to the input image (used for auto-naming).
+        output_folder: Directory to save in (defaults to CWD).
+        output_name: Specific filename (WITHOUT extension).
+        as_html: Boolean to save as .html instead of .txt.
+        cache: Optional render_cache.RenderCache checked before rendering.
+        cache_key: Key of this exact output in `cache`.
+    """
+
+    # 1-2. Determine Output Directory and File Name
+    filepath = resolve_output_path(
+        original_filename,
+        output_folder,
+        output_name,
+        ".html" if as_html else ".txt",
+    )
+    if filepath is None:
+        return None
+
+    # 3. Reuse a cached render when possible
+    use_cache = cache is not None and cache_key is not None
+    if use_cache:
+        cached_path = cache.get_path(cache_key)
+        if cached_path is not None:
+            try:
+                with profiling.stage("save"):
+                    shutil.copyfile(cached_path, filepath)
+                print(f"✅ Output saved to: {filepath}")
+                return filepath
+            except OSError:
+                pass  # Fall back to rendering
+
+    if callable(ascii_grid):
+        ascii_grid = ascii_grid()
+
+    # 4. Write File
     try:
-        with open(filepath, "w", encoding="utf-8") as f:
+        with profiling.stage("save"), open(filepath, "w", encoding="utf-8") as f:
             if as_html:
-                html_content = generate_html(ascii_grid)
-                f.write(html_content)
+                write_html(ascii_grid, f)
+            elif isinstance(ascii_grid, AsciiFrame):
+                # Add space for aspect ratio correction in text files
+                f.write(ascii_grid.to_text(pad=" "))
             else:
+                # Grayscale rows are already padded
                 for row in ascii_grid:
-                    clean_row = []
-                    for item in row:
-                        if isinstance(item, tuple):
-                            char = item[0]
-                        else:
-                            char = item
-                        # Add space for aspect ratio correction in text files
-                        clean_row.append(char + " ")
-                    f.write("".join(clean_row) + "\n")
+                    f.write(row + "\n")
+
+        if use_cache:
+            with profiling.stage("cache_store"):
+                cache.put_file(cache_key, filepath)
 
         print(f"✅ Output saved to: {filepath}")
         return filepath
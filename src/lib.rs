@@ -1,101 +1,556 @@
-use numpy::PyReadonlyArray3;
+use numpy::ndarray::Array2;
+use numpy::{
+    IntoPyArray, PyArray2, PyArray3, PyReadonlyArray1, PyReadonlyArray2, PyReadonlyArray3,
+};
+use pyo3::exceptions::PyValueError;
 use pyo3::prelude::*;
-use std::fmt::Write; // Needed to write into the string buffer efficiently
+use pyo3::types::PyByteArray;
+use std::ops::Range;
+use std::thread;
 
-/// Target A: Converts a generic RGB image array into the Grid structure
-/// Returns: List[List[(char, (r, g, b))]]
-#[pyfunction]
-fn image_to_ascii_rs(
-    _py: Python,
-    img_array: PyReadonlyArray3<u8>,
-    charset: Vec<String>,
-) -> PyResult<Vec<Vec<(String, (u8, u8, u8))>>> {
-    let array = img_array.as_array();
-    let shape = array.shape();
-    let rows = shape[0];
-    let cols = shape[1];
+/// Frames with fewer cells than this are rendered on the calling thread;
+/// below it, spawning workers costs more than it saves.
+const PARALLEL_MIN_CELLS: usize = 32 * 1024;
+
+/// Longest charset accepted; glyph indices are stored as u8, as in
+/// charset.MAX_CHARSET_LENGTH.
+const MAX_CHARSET_LEN: usize = 256;
+
+type Rgb = (u8, u8, u8);
+
+/// 256-entry table mapping a luminance byte to a charset index.
+/// Same float64 arithmetic as converter.build_index_lut, so both agree.
+fn index_lut(charset_len: usize) -> [u8; 256] {
+    let scale = (charset_len - 1) as f64 / 255.0;
+    let mut lut = [0u8; 256];
+    for (v, slot) in lut.iter_mut().enumerate() {
+        *slot = (v as f64 * scale) as u8;
+    }
+    lut
+}
+
+/// Number of threads to split `rows` x `cols` cells across.
+fn worker_count(rows: usize, cols: usize) -> usize {
+    if rows * cols < PARALLEL_MIN_CELLS {
+        return 1;
+    }
+    let cores = thread::available_parallelism().map_or(1, |n| n.get());
+    cores.min(rows).max(1)
+}
+
+/// Splits 0..rows into `parts` contiguous, nearly equal ranges.
+fn row_ranges(rows: usize, parts: usize) -> Vec<Range<usize>> {
+    let base = rows / parts;
+    let extra = rows % parts;
+    let mut ranges = Vec::with_capacity(parts);
+    let mut start = 0;
+    for i in 0..parts {
+        let end = start + base + usize::from(i < extra);
+        ranges.push(start..end);
+        start = end;
+    }
+    ranges
+}
+
+#[inline]
+fn pixel(pixels: &[u8], i: usize) -> Rgb {
+    (pixels[i * 3], pixels[i * 3 + 1], pixels[i * 3 + 2])
+}
+
+#[inline]
+fn within(a: Rgb, b: Rgb, tolerance: u8) -> bool {
+    a.0.abs_diff(b.0) <= tolerance
+        && a.1.abs_diff(b.1) <= tolerance
+        && a.2.abs_diff(b.2) <= tolerance
+}
+
+/// Color run open at the start of each range (None for the first cell).
+///
+/// Runs carry across rows, so a worker starting mid-frame needs the color
+/// that opened the run it lands in. With no tolerance that is simply the
+/// previous pixel; otherwise the run anchors are walked up to each range
+/// start, which is far cheaper than the rendering itself.
+fn run_anchors(
+    pixels: &[u8],
+    cols: usize,
+    ranges: &[Range<usize>],
+    tolerance: u8,
+) -> Vec<Option<Rgb>> {
+    let mut anchors = Vec::with_capacity(ranges.len());
+    if tolerance == 0 {
+        for range in ranges {
+            let first = range.start * cols;
+            anchors.push(if first == 0 {
+                None
+            } else {
+                Some(pixel(pixels, first - 1))
+            });
+        }
+        return anchors;
+    }
+
+    let mut run: Option<Rgb> = None;
+    let mut cell = 0;
+    for range in ranges {
+        let first = range.start * cols;
+        while cell < first {
+            let px = pixel(pixels, cell);
+            if !run.is_some_and(|anchor| within(px, anchor, tolerance)) {
+                run = Some(px);
+            }
+            cell += 1;
+        }
+        anchors.push(run);
+    }
+    anchors
+}
+
+/// Appends the decimal form of `v` (what write!("{}") would produce).
+#[inline]
+fn push_u8(out: &mut String, v: u8) {
+    if v >= 100 {
+        out.push((b'0' + v / 100) as char);
+    }
+    if v >= 10 {
+        out.push((b'0' + v / 10 % 10) as char);
+    }
+    out.push((b'0' + v % 10) as char);
+}
+
+/// Renders `rows` of an RGB frame as colored glyphs, continuing the color
+/// run `run` left open by the rows above.
+#[allow(clippy::too_many_arguments)]
+fn render_rows(
+    pixels: &[u8],
+    cols: usize,
+    rows: Range<usize>,
+    glyphs: &[String],
+    lut: &[u8; 256],
+    tolerance: u8,
+    mut run: Option<Rgb>,
+    out: &mut String,
+) {
+    for r in rows {
+        let row = &pixels[r * cols * 3..(r + 1) * cols * 3];
+        for px in row.chunks_exact(3) {
+            let color = (px[0], px[1], px[2]);
+
+            // 1. Calculate Char
+            let max_val = color.0.max(color.1).max(color.2);
+            let glyph = &glyphs[lut[max_val as usize] as usize];
+
+            // 2. Open a new color run only when the color changes
+            if !run.is_some_and(|anchor| within(color, anchor, tolerance)) {
+                out.push_str("\x1b[38;2;");
+                push_u8(out, color.0);
+                out.push(';');
+                push_u8(out, color.1);
+                out.push(';');
+                push_u8(out, color.2);
+                out.push('m');
+                run = Some(color);
+            }
+
+            // 3. Glyph plus a dot '.' for aspect ratio correction
+            out.push_str(glyph);
+            out.push('.');
+        }
+        // End of row
+        out.push('\n');
+    }
+}
 
-    let max_idx = (charset.len() - 1) as f32;
-    let scale = max_idx / 255.0;
+/// Whole-frame ANSI rendering. Rows are split across threads, each writing
+/// its own buffer; the buffers are then joined in order.
+fn render_frame(
+    pixels: &[u8],
+    rows: usize,
+    cols: usize,
+    glyphs: &[String],
+    tolerance: u8,
+    workers: usize,
+) -> String {
+    let lut = index_lut(glyphs.len());
+    let ranges = row_ranges(rows, workers);
+    let anchors = run_anchors(pixels, cols, &ranges, tolerance);
 
-    let mut grid = Vec::with_capacity(rows);
+    // Estimate buffer size to avoid reallocations: 8 bytes per cell (a glyph
+    // of up to 3 UTF-8 bytes, the '.' pad and a share of the coalesced SGR
+    // runs) plus the newline per row. Frames where most cells open a new
+    // run (up to 19 bytes each) outgrow it and reallocate.
+    let mut parts: Vec<String> = ranges
+        .iter()
+        .map(|range| String::with_capacity(range.len() * (cols * 8 + 1)))
+        .collect();
+
+    if let [part] = parts.as_mut_slice() {
+        render_rows(pixels, cols, 0..rows, glyphs, &lut, tolerance, None, part);
+    } else {
+        thread::scope(|s| {
+            for ((range, anchor), part) in ranges.iter().zip(anchors).zip(parts.iter_mut()) {
+                let range = range.clone();
+                let lut = &lut;
+                s.spawn(move || {
+                    render_rows(pixels, cols, range, glyphs, lut, tolerance, anchor, part)
+                });
+            }
+        });
+    }
+
+    let total: usize = parts.iter().map(String::len).sum();
+    let mut output = String::with_capacity(total + 4);
+    for part in &parts {
+        output.push_str(part);
+    }
+    output.push_str("\x1b[0m");
+    output
+}
+
+/// Writes the charset index of every pixel into `out` (one byte per cell),
+/// splitting the rows across threads for large frames.
+fn glyph_indices(
+    pixels: &[u8],
+    rows: usize,
+    cols: usize,
+    lut: &[u8; 256],
+    workers: usize,
+    out: &mut [u8],
+) {
+    let fill = |src: &[u8], dst: &mut [u8]| {
+        for (px, idx) in src.chunks_exact(3).zip(dst.iter_mut()) {
+            *idx = lut[px[0].max(px[1]).max(px[2]) as usize];
+        }
+    };
+
+    if workers <= 1 {
+        fill(pixels, out);
+        return;
+    }
+    let cells = rows.div_ceil(workers) * cols;
+    thread::scope(|s| {
+        for (src, dst) in pixels.chunks(cells * 3).zip(out.chunks_mut(cells)) {
+            s.spawn(move || fill(src, dst));
+        }
+    });
+}
+
+/// Floyd–Steinberg error diffusion of a luminance frame to `values.len()`
+/// glyph levels, writing each pixel's level as `values[level]`. Errors are
+/// kept in 1/16ths of a luminance step with floored division, matching the
+/// NumPy fallback in dither.py bit for bit.
+fn floyd_steinberg(pixels: &[u8], rows: usize, cols: usize, values: &[u8], out: &mut [u8]) {
+    let steps = values.len() as i32 - 1;
+    let full: i32 = 255 * 16;
+    // Error owed to this row and the next, padded by one cell on each side
+    let mut cur = vec![0i32; cols + 2];
+    let mut next = vec![0i32; cols + 2];
 
     for r in 0..rows {
-        let mut row_data = Vec::with_capacity(cols);
         for c in 0..cols {
-            let pixel = (
-                *array.get([r, c, 0]).unwrap_or(&0),
-                *array.get([r, c, 1]).unwrap_or(&0),
-                *array.get([r, c, 2]).unwrap_or(&0),
-            );
-
-            let max_val = pixel.0.max(pixel.1).max(pixel.2);
-            let idx = (max_val as f32 * scale) as usize;
-            let safe_idx = idx.min(charset.len() - 1);
-            let char_str = &charset[safe_idx];
-
-            row_data.push((char_str.clone(), pixel));
+            let i = r * cols + c;
+            let value = (pixels[i] as i32 * 16 + cur[c + 1]).clamp(0, full);
+            let level = (value * steps + 255 * 8) / full;
+            let e = value - level * full / steps;
+            out[i] = values[level as usize];
+
+            cur[c + 2] += (e * 7).div_euclid(16);
+            next[c] += (e * 3).div_euclid(16);
+            next[c + 1] += (e * 5).div_euclid(16);
+            next[c + 2] += e.div_euclid(16);
         }
-        grid.push(row_data);
+        std::mem::swap(&mut cur, &mut next);
+        next.fill(0);
     }
+}
 
-    Ok(grid)
+/// Checks a charset of `len` glyphs fits the u8 index table.
+fn check_charset_len(len: usize) -> PyResult<()> {
+    if len == 0 {
+        return Err(PyValueError::new_err("Charset must be a non-empty string."));
+    }
+    if len > MAX_CHARSET_LEN {
+        return Err(PyValueError::new_err(format!(
+            "Charset cannot contain more than {MAX_CHARSET_LEN} characters."
+        )));
+    }
+    Ok(())
+}
+
+/// Checks the array is (H, W, 3) and the charset fits the index table.
+fn check_frame(shape: &[usize], charset_len: usize) -> PyResult<()> {
+    if shape[2] != 3 {
+        return Err(PyValueError::new_err("Expected an (H, W, 3) RGB array."));
+    }
+    check_charset_len(charset_len)
+}
+
+/// Target A: Glyph indices for an RGB image array, without per-cell objects.
+/// Returns: (indices, colors) where indices is a new (H, W) uint8 array of
+/// positions into the charset and colors is the input array itself, the
+/// same layout as frame.AsciiFrame.
+#[pyfunction]
+fn image_to_indices_rs<'py>(
+    py: Python<'py>,
+    img_array: PyReadonlyArray3<'py, u8>,
+    charset_len: usize,
+) -> PyResult<(Bound<'py, PyArray2<u8>>, Bound<'py, PyArray3<u8>>)> {
+    let array = img_array.as_array();
+    let (rows, cols) = (array.shape()[0], array.shape()[1]);
+    check_frame(array.shape(), charset_len)?;
+
+    // Borrowed when already C-contiguous, copied once otherwise
+    let standard = array.as_standard_layout();
+    let pixels = standard.as_slice().unwrap();
+
+    let indices = py.allow_threads(|| {
+        let mut out = vec![0u8; rows * cols];
+        let lut = index_lut(charset_len);
+        glyph_indices(pixels, rows, cols, &lut, worker_count(rows, cols), &mut out);
+        out
+    });
+    // The Vec becomes the array's buffer; nothing is copied
+    let indices = Array2::from_shape_vec((rows, cols), indices)
+        .expect("rows * cols cells")
+        .into_pyarray_bound(py);
+    Ok((indices, (*img_array).clone()))
 }
 
 /// Target B: Renders an entire frame directly to a single ANSI string.
 /// Eliminates thousands of Python string allocations per frame.
+///
+/// Colors are run-length coalesced: an SGR sequence is only written when the
+/// color moves more than `color_tolerance` (per channel) away from the color
+/// that opened the current run, and a single reset closes the frame.
+///
+/// The GIL is released while rendering, and large frames are split by rows
+/// across all cores.
 #[pyfunction]
+#[pyo3(signature = (img_array, charset, color_tolerance=0))]
 fn render_frame_to_string(
-    _py: Python,
-    img_array: PyReadonlyArray3<u8>,
+    py: Python<'_>,
+    img_array: PyReadonlyArray3<'_, u8>,
     charset: Vec<String>,
+    color_tolerance: u8,
 ) -> PyResult<String> {
     let array = img_array.as_array();
-    let shape = array.shape();
-    let rows = shape[0];
-    let cols = shape[1];
+    let (rows, cols) = (array.shape()[0], array.shape()[1]);
+    check_frame(array.shape(), charset.len())?;
 
-    // Estimate buffer size to avoid reallocations.
-    // Each pixel needs approx 20-25 bytes for ANSI codes: "\x1b[38;2;255;255;255mX\x1b[0m"
-    // + newlines.
-    let capacity = rows * cols * 25 + rows;
-    let mut output = String::with_capacity(capacity);
+    // Borrowed when already C-contiguous, copied once otherwise
+    let standard = array.as_standard_layout();
+    let pixels = standard.as_slice().unwrap();
 
-    let max_idx = (charset.len() - 1) as f32;
-    let scale = max_idx / 255.0;
+    Ok(py.allow_threads(|| {
+        let workers = worker_count(rows, cols);
+        render_frame(pixels, rows, cols, &charset, color_tolerance, workers)
+    }))
+}
 
-    for r in 0..rows {
-        for c in 0..cols {
-            let r_val = *array.get([r, c, 0]).unwrap_or(&0);
-            let g_val = *array.get([r, c, 1]).unwrap_or(&0);
-            let b_val = *array.get([r, c, 2]).unwrap_or(&0);
+/// Target D: Floyd–Steinberg dithering of an (H, W) uint8 luminance frame.
+/// `levels` holds the luminance byte written for each glyph level.
+/// Returns: new (H, W) uint8 array.
+#[pyfunction]
+fn floyd_steinberg_rs<'py>(
+    py: Python<'py>,
+    gray: PyReadonlyArray2<'py, u8>,
+    levels: PyReadonlyArray1<'py, u8>,
+) -> PyResult<Bound<'py, PyArray2<u8>>> {
+    let values = levels.as_array().to_vec();
+    if values.len() < 2 {
+        return Err(PyValueError::new_err(
+            "Dithering needs at least two glyphs.",
+        ));
+    }
+    let array = gray.as_array();
+    let (rows, cols) = (array.shape()[0], array.shape()[1]);
 
-            // 1. Calculate Char
-            let max_val = r_val.max(g_val).max(b_val);
-            let idx = (max_val as f32 * scale) as usize;
-            let safe_idx = idx.min(charset.len() - 1);
-            let char_str = &charset[safe_idx];
-
-            // 2. Write ANSI directly to buffer
-            // Format: \x1b[38;2;R;G;BmCHAR.\x1b[0m
-            // We append a dot '.' after the char for aspect ratio correction (same as your Python code)
-            write!(
-                output,
-                "\x1b[38;2;{};{};{}m{}.\x1b[0m",
-                r_val, g_val, b_val, char_str
-            )
-            .unwrap();
+    // Borrowed when already C-contiguous, copied once otherwise
+    let standard = array.as_standard_layout();
+    let pixels = standard.as_slice().unwrap();
+
+    let out = py.allow_threads(|| {
+        let mut out = vec![0u8; rows * cols];
+        floyd_steinberg(pixels, rows, cols, &values, &mut out);
+        out
+    });
+    Ok(Array2::from_shape_vec((rows, cols), out)
+        .expect("rows * cols cells")
+        .into_pyarray_bound(py))
+}
+
+/// Target C: Grayscale frames to padded text, written into a caller-owned
+/// bytearray that is reused from frame to frame.
+#[pyclass(module = "ascii_art.ascii_art_rs", frozen)]
+struct GrayRenderer {
+    /// UTF-8 bytes of glyph + pad for every luminance byte
+    cells: Vec<Vec<u8>>,
+    /// Longest entry of `cells`, for sizing the output
+    max_cell: usize,
+}
+
+impl GrayRenderer {
+    fn render(&self, pixels: &[u8], cols: usize, out: &mut [u8]) -> usize {
+        let mut pos = 0;
+        for (r, row) in pixels.chunks_exact(cols).enumerate() {
+            if r > 0 {
+                out[pos] = b'\n';
+                pos += 1;
+            }
+            for &v in row {
+                let cell = &self.cells[v as usize];
+                out[pos..pos + cell.len()].copy_from_slice(cell);
+                pos += cell.len();
+            }
         }
-        // End of row
-        output.push('\n');
+        pos
+    }
+}
+
+#[pymethods]
+impl GrayRenderer {
+    #[new]
+    #[pyo3(signature = (charset, pad=" "))]
+    fn new(charset: &str, pad: &str) -> PyResult<Self> {
+        let glyphs: Vec<char> = charset.chars().collect();
+        check_charset_len(glyphs.len())?;
+        let cells: Vec<Vec<u8>> = index_lut(glyphs.len())
+            .iter()
+            .map(|&i| format!("{}{}", glyphs[i as usize], pad).into_bytes())
+            .collect();
+        let max_cell = cells.iter().map(Vec::len).max().unwrap_or(0);
+        Ok(GrayRenderer { cells, max_cell })
     }
 
-    Ok(output)
+    /// Renders an (H, W) uint8 frame as rows of glyph + pad joined by "\n"
+    /// (no trailing newline) into `out`, growing it only when it is too
+    /// small. Returns the number of bytes written. The GIL is released
+    /// while rendering, so `out` must not be touched by other threads.
+    fn render_into(
+        &self,
+        py: Python<'_>,
+        gray: PyReadonlyArray2<'_, u8>,
+        out: &Bound<'_, PyByteArray>,
+    ) -> PyResult<usize> {
+        let array = gray.as_array();
+        let (rows, cols) = (array.shape()[0], array.shape()[1]);
+        if rows == 0 || cols == 0 {
+            return Ok(0);
+        }
+
+        let needed = rows * (cols * self.max_cell + 1);
+        if out.len() < needed {
+            out.resize(needed)?;
+        }
+
+        // Borrowed when already C-contiguous, copied once otherwise
+        let standard = array.as_standard_layout();
+        let pixels = standard.as_slice().unwrap();
+        // SAFETY: the buffer is only resized above, with the GIL held, and
+        // the caller does not share it while the frame renders.
+        let buf = unsafe { out.as_bytes_mut() };
+
+        Ok(py.allow_threads(|| self.render(pixels, cols, buf)))
+    }
 }
 
 #[pymodule]
 fn ascii_art_rs(_py: Python, m: &Bound<'_, PyModule>) -> PyResult<()> {
-    m.add_function(wrap_pyfunction!(image_to_ascii_rs, m)?)?;
+    m.add_function(wrap_pyfunction!(image_to_indices_rs, m)?)?;
     m.add_function(wrap_pyfunction!(render_frame_to_string, m)?)?;
+    m.add_function(wrap_pyfunction!(floyd_steinberg_rs, m)?)?;
+    m.add_class::<GrayRenderer>()?;
     Ok(())
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn frame(rows: usize, cols: usize) -> Vec<u8> {
+        // Deterministic noise with flat stretches so runs form and break
+        let mut state: u32 = 7;
+        (0..rows * cols * 3)
+            .map(|i| {
+                state = state.wrapping_mul(1_103_515_245).wrapping_add(12_345);
+                if (i / 3 / 17) % 3 == 0 {
+                    120
+                } else {
+                    (state >> 16) as u8
+                }
+            })
+            .collect()
+    }
+
+    #[test]
+    fn parallel_rendering_matches_single_thread() {
+        let glyphs: Vec<String> = " .:-=+*#%@".chars().map(String::from).collect();
+        let (rows, cols) = (300, 200);
+        let pixels = frame(rows, cols);
+
+        for tolerance in [0u8, 8, 32] {
+            let expected = render_frame(&pixels, rows, cols, &glyphs, tolerance, 1);
+            for workers in [2, 3, 7] {
+                let got = render_frame(&pixels, rows, cols, &glyphs, tolerance, workers);
+                assert_eq!(got, expected);
+            }
+        }
+    }
+
+    #[test]
+    fn parallel_indices_match_single_thread() {
+        let (rows, cols) = (301, 200);
+        let pixels = frame(rows, cols);
+        let lut = index_lut(10);
+
+        let expected: Vec<u8> = pixels
+            .chunks_exact(3)
+            .map(|px| lut[px[0].max(px[1]).max(px[2]) as usize])
+            .collect();
+        for workers in [1, 2, 3, 7] {
+            let mut got = vec![0u8; rows * cols];
+            glyph_indices(&pixels, rows, cols, &lut, workers, &mut got);
+            assert_eq!(got, expected);
+        }
+    }
+
+    #[test]
+    fn gray_renderer_pads_and_joins_rows() {
+        let renderer = GrayRenderer::new(" #█", ".").unwrap();
+        let pixels = [0u8, 128, 255, 255, 0, 0];
+        let mut out = vec![0u8; 2 * (3 * renderer.max_cell + 1)];
+        let n = renderer.render(&pixels, 3, &mut out);
+        assert_eq!(std::str::from_utf8(&out[..n]).unwrap(), " .#.█.\n█. . .");
+    }
+
+    #[test]
+    fn floyd_steinberg_keeps_flat_tone() {
+        // 10 levels, level k at luminance ceil(k * 255 / 9)
+        let values: Vec<u8> = (0..10).map(|k| ((k * 255 + 8) / 9) as u8).collect();
+        let (rows, cols) = (40, 60);
+        let pixels = vec![100u8; rows * cols];
+        let mut out = vec![0u8; rows * cols];
+        floyd_steinberg(&pixels, rows, cols, &values, &mut out);
+
+        let level = |v: u8| values.iter().position(|&x| x == v).unwrap();
+        let mean = out.iter().map(|&v| level(v) as f64).sum::<f64>() / out.len() as f64;
+        assert!((mean * 255.0 / 9.0 - 100.0).abs() < 1.0);
+        assert!(out.iter().all(|&v| v == values[3] || v == values[4]));
+    }
+
+    #[test]
+    fn index_lut_spans_charset() {
+        let lut = index_lut(70);
+        assert_eq!(lut[0], 0);
+        assert_eq!(lut[255], 69);
+        assert_eq!(index_lut(1), [0u8; 256]);
+    }
+
+    #[test]
+    fn push_u8_matches_format() {
+        for v in 0..=255u8 {
+            let mut s = String::new();
+            push_u8(&mut s, v);
+            assert_eq!(s, v.to_string());
+        }
+    }
+}
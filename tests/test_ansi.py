@@ -0,0 +1,175 @@
+import re
+
+import numpy as np
+import pytest
+
+from ascii_art import ansi
+from ascii_art.frame import AsciiFrame
+
+CHARSET = " .:-=+*#%@"
+PAD = "."
+CONTROL = re.compile(r"\033\[([0-9;]*)([Hm])")
+
+
+class Screen:
+    """Just enough of a terminal to replay frame_to_ansi and diff() output."""
+
+    def __init__(self, rows, cols):
+        self.cells = [[None] * cols for _ in range(rows)]
+        self.row = self.col = 0
+        self.pen = None
+
+    def feed(self, data):
+        pos = 0
+        for m in CONTROL.finditer(data):
+            self._text(data[pos : m.start()])
+            params, command = m.groups()
+            if command == "H":
+                row, col = (int(p) for p in params.split(";")) if params else (1, 1)
+                self.row, self.col = row - 1, col - 1
+            else:
+                self.pen = None if params == "0" else params
+            pos = m.end()
+        self._text(data[pos:])
+
+    def _text(self, text):
+        for ch in text:
+            if ch == "\n":
+                self.row, self.col = self.row + 1, 0
+            else:
+                self.cells[self.row][self.col] = (ch, self.pen)
+                self.col += 1
+
+
+def full_frame(frame, depth=24, tolerance=0):
+    if not frame.has_color:
+        return frame.to_text(PAD)
+    return ansi.frame_to_ansi(frame, PAD, tolerance, depth)
+
+
+def repaint(frame, depth=24):
+    screen = Screen(frame.height, frame.width * (1 + len(PAD)))
+    screen.feed(full_frame(frame, depth))
+    return screen.cells
+
+
+def play(frames, renderer):
+    """Replays frames the way playback does; returns screens and diff() results."""
+    h, w = frames[0].shape
+    screen = Screen(h, w * (1 + len(PAD)))
+    screens, diffs = [], []
+    for frame in frames:
+        delta = renderer.diff(frame)
+        if delta is None:
+            screen.feed(ansi.cursor_to(0, 0))
+            screen.feed(full_frame(frame, renderer.depth, renderer.tolerance))
+        else:
+            screen.feed(delta)
+        screens.append([row[:] for row in screen.cells])
+        diffs.append(delta)
+    return screens, diffs
+
+
+def changing_frames(color=True, count=6, seed=5):
+    """Frames where a few scattered cells and short stretches change."""
+    rng = np.random.default_rng(seed)
+    h, w = 12, 20
+    indices = rng.integers(0, len(CHARSET), (h, w), dtype=np.uint8)
+    palette = rng.integers(0, 256, (4, 3), dtype=np.uint8)
+    colors = palette[rng.integers(0, 4, (h, w))]
+
+    frames = []
+    for _ in range(count):
+        frames.append(
+            AsciiFrame(indices.copy(), CHARSET, colors.copy() if color else None)
+        )
+        ys = rng.integers(0, h, 12)
+        xs = rng.integers(0, w - 3, 12)
+        for y, x in zip(ys, xs):
+            n = int(rng.integers(1, 4))
+            indices[y, x : x + n] = rng.integers(0, len(CHARSET), n)
+            colors[y, x : x + n] = palette[rng.integers(0, 4)]
+    return frames
+
+
+@pytest.mark.parametrize("depth", [24, 256, 16])
+def test_replayed_deltas_match_full_repaints(depth):
+    frames = changing_frames()
+    screens, diffs = play(frames, ansi.DeltaRenderer(PAD, depth=depth))
+
+    assert diffs[0] is None
+    assert all(d for d in diffs[1:])
+    for frame, screen in zip(frames, screens):
+        assert screen == repaint(frame, depth)
+
+
+def test_replayed_grayscale_deltas_match_full_repaints():
+    frames = changing_frames(color=False)
+    screens, diffs = play(frames, ansi.DeltaRenderer(PAD))
+
+    assert all(d and ansi.RESET not in d for d in diffs[1:])
+    for frame, screen in zip(frames, screens):
+        assert screen == repaint(frame)
+
+
+def test_unchanged_frame_needs_no_output():
+    frame = changing_frames(count=1)[0]
+    renderer = ansi.DeltaRenderer(PAD)
+    assert renderer.diff(frame) is None
+    assert renderer.diff(frame[:, :]) == ""
+
+
+def test_color_runs_span_cursor_jumps():
+    indices = np.zeros((3, 8), dtype=np.uint8)
+    colors = np.full((3, 8, 3), 40, dtype=np.uint8)
+    renderer = ansi.DeltaRenderer(PAD)
+    renderer.diff(AsciiFrame(indices.copy(), CHARSET, colors.copy()))
+
+    # Two separate stretches on two rows, all in one new color
+    indices[0, 1:3] = 9
+    indices[2, 5] = 9
+    colors[0, 1:3] = colors[2, 5] = (200, 10, 10)
+    delta = renderer.diff(AsciiFrame(indices, CHARSET, colors))
+
+    assert delta == (
+        ansi.cursor_to(0, 2) + "\033[38;2;200;10;10m" + "@.@."
+        + ansi.cursor_to(2, 10) + "@." + ansi.RESET
+    )  # fmt: skip
+
+
+def test_large_changes_fall_back_to_a_full_repaint():
+    frames = changing_frames(count=1)
+    frame = frames[0]
+    renderer = ansi.DeltaRenderer(PAD, threshold=0.5)
+    renderer.diff(frame)
+
+    indices = frame.indices.copy()
+    indices[:7] = (indices[:7] + 1) % len(CHARSET)  # 7 of 12 rows
+    changed = AsciiFrame(indices, CHARSET, frame.colors)
+    assert renderer.diff(changed) is None
+    # The repainted frame is now the reference
+    assert renderer.diff(changed) == ""
+
+    indices = indices.copy()
+    indices[:5] = (indices[:5] + 1) % len(CHARSET)  # 5 of 12 rows
+    assert renderer.diff(AsciiFrame(indices, CHARSET, frame.colors))
+
+
+def test_drift_below_tolerance_is_redrawn_once_it_adds_up():
+    indices = np.full((2, 4), 3, dtype=np.uint8)
+    colors = np.full((2, 4, 3), 100, dtype=np.uint8)
+    renderer = ansi.DeltaRenderer(PAD, tolerance=8)
+    screen = Screen(2, 8)
+    screen.feed(ansi.frame_to_ansi(AsciiFrame(indices, CHARSET, colors), PAD))
+    renderer.diff(AsciiFrame(indices, CHARSET, colors))
+
+    # One cell brightens by 3 per frame: invisible until it is 9 away
+    deltas = []
+    for step in range(1, 4):
+        colors = colors.copy()
+        colors[1, 2] = 100 + 3 * step
+        deltas.append(renderer.diff(AsciiFrame(indices, CHARSET, colors)))
+    assert deltas[:2] == ["", ""]
+
+    screen.feed(deltas[2])
+    assert screen.cells == repaint(AsciiFrame(indices, CHARSET, colors))
@@ -0,0 +1,39 @@
+import pytest
+
+from ascii_art import asv
+
+
+def test_round_trip_keeps_frames_flags_and_timing(tmp_path):
+    path = tmp_path / "clip.asv"
+    frames = ["\033[Hab\ncd", "", "\033[1;2Hé"]
+    with asv.AsvWriter(path, columns=4, rows=2, fps=25.0) as w:
+        w.add(frames[0], keyframe=True)
+        w.add(frames[1])
+        w.add(frames[2])
+
+    with asv.AsvFile(path) as f:
+        assert (f.columns, f.rows, f.fps, len(f)) == (4, 2, 25.0, 3)
+        assert [bytes(f.frame(i)).decode("utf-8") for i in range(3)] == frames
+        assert f.index["flags"].tolist() == [asv.KEYFRAME, 0, 0]
+        assert f.index["pts_us"].tolist() == [0, 40_000, 80_000]
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "clip.asv"
+    path.write_bytes(b"not a container at all, just some bytes")
+    with pytest.raises(ValueError):
+        asv.AsvFile(path)
+
+
+@pytest.mark.parametrize("finished", [False, True])
+def test_rejects_files_without_frames(tmp_path, finished):
+    path = tmp_path / "clip.asv"
+    w = asv.AsvWriter(path, columns=4, rows=2, fps=25.0)
+    if finished:
+        w.close()
+    else:
+        # Interrupted export: frames written but never indexed
+        w.add("\033[Hab\ncd", keyframe=True)
+        w._f.close()
+    with pytest.raises(ValueError, match="no frames"):
+        asv.AsvFile(path)
@@ -0,0 +1,63 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from ascii_art import batch, cli
+
+
+def parse(monkeypatch, *argv):
+    monkeypatch.setattr(sys, "argv", ["asciify", *argv])
+    return cli.parse_args()
+
+
+def test_output_names_keep_clashing_inputs_apart():
+    paths = [
+        Path("in/photo.png"),
+        Path("in/photo.jpg"),
+        Path("in/photo-1.bmp"),
+        Path("in/a/x.png"),
+        Path("in/b/x.png"),
+        Path("in/Y.png"),
+        Path("in/y.gif"),
+    ]
+    names = batch.output_names(paths)
+    assert names == [
+        "photo_png",
+        "photo_jpg",
+        "photo-1",
+        "a_x_png",
+        "b_x_png",
+        "Y_png",
+        "y_gif",
+    ]
+
+
+def test_output_names_add_a_counter_as_last_resort():
+    paths = [Path("in/a b.png"), Path("in/ab.png"), Path("in/ab_png.gif")]
+    assert batch.output_names(paths) == ["ab_png", "ab_png-2", "ab_png-3"]
+
+
+def test_batch_writes_one_file_per_input(tmp_path, monkeypatch):
+    src = tmp_path / "in"
+    src.mkdir()
+    pixels = np.linspace(0, 255, 8 * 6, dtype=np.uint8).reshape(6, 8)
+    for name in ("photo.png", "photo.jpg", "photo-1.bmp"):
+        Image.fromarray(pixels).save(src / name)
+
+    out = tmp_path / "out"
+    args = parse(
+        monkeypatch,
+        "--batch", str(src), "--output-folder", str(out),
+        "--width", "8", "--no-cache", "--jobs", "2",
+    )  # fmt: skip
+    batch.run_batch(args)
+    assert len(list(out.iterdir())) == 3
+
+
+@pytest.mark.parametrize("jobs", ["0", "-1", "many"])
+def test_jobs_must_be_positive(monkeypatch, jobs):
+    with pytest.raises(SystemExit):
+        parse(monkeypatch, "--batch", "in", "--jobs", jobs)
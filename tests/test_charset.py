@@ -0,0 +1,13 @@
+import pytest
+
+from ascii_art import charset
+
+
+def test_custom_charset_is_used_as_given():
+    assert charset.get_charset("ab") == "ab"
+
+
+def test_custom_charset_longer_than_index_range_is_rejected():
+    assert charset.get_charset("x" * 256) == "x" * 256
+    with pytest.raises(ValueError):
+        charset.get_charset("x" * 257)
@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from ascii_art import ansi, converter
+from ascii_art.charset import CHARSETS
+
+CHARSET = CHARSETS["default"]
+
+
+@pytest.fixture
+def rgb():
+    rng = np.random.default_rng(7)
+    arr = rng.integers(0, 256, (24, 40, 3), dtype=np.uint8)
+    # A flat stripe so color runs get coalesced
+    arr[5:9] = (30, 120, 200)
+    return arr
+
+
+def reference_index(value):
+    """Per-pixel glyph index, written out the slow way."""
+    return int(value * (len(CHARSET) - 1) / 255)
+
+
+def test_grayscale_matches_per_pixel_reference(rgb):
+    rows = converter.image_to_ascii(Image.fromarray(rgb), CHARSET)
+    expected = [
+        "".join(CHARSET[reference_index(max(px))] + " " for px in row.tolist())
+        for row in rgb
+    ]
+    assert rows == expected
+
+
+def test_color_frame_keeps_pixels_and_indices(rgb):
+    frame = converter.image_to_ascii_with_color(Image.fromarray(rgb), CHARSET)
+    assert np.array_equal(frame.colors, rgb)
+    assert frame.indices.tolist() == [
+        [reference_index(max(px)) for px in row.tolist()] for row in rgb
+    ]
+
+
+@pytest.mark.parametrize("tolerance", [0, 8, 32])
+def test_rust_renderer_matches_numpy(rgb, tolerance):
+    rs = pytest.importorskip("ascii_art.ascii_art_rs")
+    frame = converter.array_to_frame(rgb, CHARSET)
+    expected = ansi.frame_to_ansi(frame, tolerance=tolerance)
+    got = rs.render_frame_to_string(rgb, list(CHARSET), tolerance)
+    assert got == expected
+
+
+def test_rust_indices_match_numpy(rgb):
+    rs = pytest.importorskip("ascii_art.ascii_art_rs")
+    indices, colors = rs.image_to_indices_rs(rgb, len(CHARSET))
+    assert colors is rgb
+    assert indices.dtype == np.uint8
+    assert np.array_equal(
+        indices, converter.build_index_lut(len(CHARSET))[rgb.max(axis=2)]
+    )
+
+
+def test_index_lut_spans_the_longest_charset():
+    lut = converter.build_index_lut(256)
+    assert (lut[0], lut[255]) == (0, 255)
+    # Indices past 255 would wrap around in uint8
+    with pytest.raises(ValueError):
+        converter.build_index_lut(257)
+
+
+@pytest.mark.parametrize("charset", [CHARSET, "▁▂▃▄▅▆▇█", " .█"])
+def test_gray_renderer_matches_gray_to_text(rgb, charset, monkeypatch):
+    monkeypatch.setattr(converter, "NativeGrayRenderer", None)
+    gray = converter.luminance(rgb)
+    expected = converter.gray_to_text(gray, converter.build_glyph_lut(charset))[:-1]
+
+    renderer = converter.GrayRenderer(charset)
+    assert bytes(renderer.render(gray)).decode("utf-8") == expected
+    # The buffer is reused for the next frame of the same size
+    buffer = renderer.buffer
+    assert bytes(renderer.render(gray[::-1])).decode("utf-8") == (
+        converter.gray_to_text(gray[::-1], converter.build_glyph_lut(charset))[:-1]
+    )
+    assert renderer.buffer is buffer
+
+
+@pytest.mark.parametrize("charset", [CHARSET, " .█"])
+def test_gray_renderer_keeps_views_valid_as_frames_grow(charset, monkeypatch):
+    monkeypatch.setattr(converter, "NativeGrayRenderer", None)
+    renderer = converter.GrayRenderer(charset)
+    lut = converter.build_glyph_lut(charset)
+
+    # Spaces encode to 1 byte and "█" to 3, so the second frame is larger
+    dark = np.zeros((6, 9), dtype=np.uint8)
+    bright = np.full((6, 9), 255, dtype=np.uint8)
+    view = renderer.render(dark)
+    size = len(renderer.buffer)
+    grown = renderer.render(bright)
+
+    assert len(renderer.buffer) == size
+    assert len(grown) >= len(view)
+    assert bytes(grown).decode("utf-8") == converter.gray_to_text(bright, lut)[:-1]
+
+
+def test_native_gray_renderer_matches_fallback(rgb):
+    rs = pytest.importorskip("ascii_art.ascii_art_rs")
+    gray = converter.luminance(rgb)
+    buffer = bytearray()
+    n = rs.GrayRenderer(CHARSET, converter.GRAY_PAD).render_into(gray, buffer)
+    expected = converter.gray_to_text(gray, converter.build_glyph_lut(CHARSET))[:-1]
+    assert bytes(buffer[:n]).decode("utf-8") == expected
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from ascii_art import converter, dither
+
+
+def reference_floyd_steinberg(gray, levels):
+    """Plain scanline Floyd–Steinberg with the same integer arithmetic."""
+    values = dither.level_values(levels)
+    h, w = gray.shape
+    err = [[0] * w for _ in range(h)]
+    out = np.empty((h, w), dtype=np.uint8)
+    full = 255 * 16
+    for y in range(h):
+        for x in range(w):
+            value = min(max(int(gray[y, x]) * 16 + err[y][x], 0), full)
+            k = (value * (levels - 1) + 255 * 8) // full
+            e = value - (k * full) // (levels - 1)
+            out[y, x] = values[k]
+            for dy, dx, weight in ((0, 1, 7), (1, -1, 3), (1, 0, 5), (1, 1, 1)):
+                if y + dy < h and 0 <= x + dx < w:
+                    err[y + dy][x + dx] += (e * weight) // 16
+    return out
+
+
+@pytest.fixture
+def gray():
+    rng = np.random.default_rng(11)
+    arr = rng.integers(0, 256, (23, 37), dtype=np.uint8)
+    arr[:8] = np.linspace(0, 255, 37, dtype=np.uint8)
+    return arr
+
+
+@pytest.mark.parametrize("levels", [2, 5, 70])
+def test_floyd_steinberg_fallback_matches_scanline(gray, levels, monkeypatch):
+    monkeypatch.setattr(dither, "floyd_steinberg_rs", None)
+    expected = reference_floyd_steinberg(gray, levels)
+    assert np.array_equal(dither.floyd_steinberg(gray, levels), expected)
+
+
+def test_native_floyd_steinberg_matches_fallback(gray, monkeypatch):
+    rs = pytest.importorskip("ascii_art.ascii_art_rs")
+    got = rs.floyd_steinberg_rs(gray, dither.level_values(10))
+    monkeypatch.setattr(dither, "floyd_steinberg_rs", None)
+    assert np.array_equal(got, dither.floyd_steinberg(gray, 10))
+
+
+@pytest.mark.parametrize("mode", ["bayer", "blue-noise", "floyd-steinberg"])
+def test_flat_areas_keep_their_tone(mode):
+    levels = 4
+    flat = np.full((64, 64), 100, dtype=np.uint8)
+    indices = converter.build_index_lut(levels)[dither.Ditherer(mode, levels)(flat)]
+    # Without dithering every cell would be glyph 1 (tone 85)
+    assert set(np.unique(indices).tolist()) == {1, 2}
+    assert indices.mean() * 255 / (levels - 1) == pytest.approx(100, abs=1.5)
+
+
+def test_ordered_bands_line_up(gray):
+    ditherer = dither.Ditherer("bayer", 10)
+    whole = ditherer(gray)
+    bands = np.concatenate([ditherer(gray[:5]), ditherer(gray[5:], y0=5)])
+    assert np.array_equal(bands, whole)
+
+
+def test_blue_noise_ranks_every_cell_once():
+    thresholds = dither.blue_noise(16)
+    ranks = np.sort((thresholds * thresholds.size - 0.5).round().ravel())
+    assert np.array_equal(ranks, np.arange(thresholds.size))
@@ -0,0 +1,104 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from ascii_art import render_cache
+
+CHARSET = " .:-=+*#%@"
+
+
+def make_args(**overrides):
+    args = dict(color=False, dither="none", color_depth=24, color_tolerance=0)
+    args.update(overrides)
+    return SimpleNamespace(**args)
+
+
+def key_for(args=None, chars=CHARSET, width=80, height=40, source="abc", kind="txt"):
+    params = render_cache.output_params(args or make_args(), chars, width, height)
+    return render_cache.make_key(source, kind, params)
+
+
+def test_same_inputs_give_the_same_key():
+    assert key_for() == key_for()
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        dict(width=81),
+        dict(height=41),
+        dict(chars=CHARSET[::-1]),
+        dict(args=make_args(color=True)),
+        dict(args=make_args(dither="bayer")),
+        dict(source="abd"),
+        dict(kind="html"),
+    ],
+)
+def test_output_settings_change_the_key(change):
+    assert key_for(**change) != key_for()
+
+
+def test_color_settings_only_count_with_color():
+    # Grayscale output ignores the palette, so its entries are shared
+    assert key_for(make_args(color_depth=256, color_tolerance=8)) == key_for()
+
+    color = make_args(color=True)
+    assert key_for(make_args(color=True, color_depth=256)) != key_for(color)
+    assert key_for(make_args(color=True, color_tolerance=8)) != key_for(color)
+
+
+def test_dither_off_is_left_out_of_the_params():
+    params = render_cache.output_params(make_args(), CHARSET, 80, 40)
+    assert "dither" not in params
+
+
+def put_aged(cache, key, size, age):
+    """Stores `size` bytes under `key`, last used `age` seconds ago."""
+    cache.put_text(key, "x" * size)
+    t = 1_000_000 - age
+    os.utime(cache._path(key), (t, t))
+
+
+def test_eviction_drops_least_recently_used_first(tmp_path):
+    cache = render_cache.RenderCache(tmp_path, max_bytes=350)
+    put_aged(cache, "aa01", 100, age=30)
+    put_aged(cache, "bb02", 100, age=20)
+    put_aged(cache, "cc03", 100, age=10)
+    # Reading refreshes an entry, so the oldest is now bb02
+    assert cache.get_path("aa01") is not None
+
+    cache.put_text("dd04", "x" * 100)
+    assert cache.get_path("bb02") is None
+    for key in ("aa01", "cc03", "dd04"):
+        assert cache.get_path(key) is not None
+
+
+def test_eviction_trims_below_the_cap(tmp_path):
+    cache = render_cache.RenderCache(tmp_path, max_bytes=1000)
+    for i in range(10):
+        put_aged(cache, f"{i:02d}ab", 100, age=100 - i)
+    cache.put_text("zzzz", "x" * 100)
+
+    left = [f"{i:02d}ab" for i in range(10) if cache.get_path(f"{i:02d}ab")]
+    # Oldest first, down to EVICT_TO of the cap
+    assert left == [f"{i:02d}ab" for i in range(2, 10)]
+    assert cache._read_usage() == 900
+
+
+def test_writes_under_the_cap_do_not_scan(tmp_path, monkeypatch):
+    cache = render_cache.RenderCache(tmp_path, max_bytes=1000)
+    scans = []
+    evict = cache.evict
+    monkeypatch.setattr(cache, "evict", lambda: scans.append(1) or evict())
+
+    for i in range(8):
+        cache.put_text(f"{i:02d}ab", "x" * 100)
+    # Only the first write scans, to learn the size of the existing cache
+    assert len(scans) == 1
+    assert cache._read_usage() == 800
+
+    cache.put_text("08ab", "x" * 100)
+    cache.put_text("09ab", "x" * 100)
+    cache.put_text("10ab", "x" * 100)
+    assert len(scans) == 2
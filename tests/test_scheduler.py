@@ -0,0 +1,103 @@
+import pytest
+
+from ascii_art.scheduler import PlaybackScheduler
+
+
+class FakeClock:
+    """Monotonic clock that only moves when told to (or slept on)."""
+
+    def __init__(self, now=100.0):
+        self.now = now
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def scheduler(clock):
+    s = PlaybackScheduler(10, clock=clock, sleep=clock.sleep)
+    s.start()
+    return s
+
+
+def test_frames_are_due_on_the_source_timeline(scheduler):
+    assert scheduler.due(0) == 100.0
+    assert scheduler.due(25) == pytest.approx(102.5)
+
+
+def test_wait_sleeps_until_the_frame_is_due(scheduler, clock):
+    clock.now += 0.03  # Rendering took 30 ms
+    scheduler.wait(1)
+    assert clock.slept == [pytest.approx(0.07)]
+    assert clock.now == pytest.approx(100.1)
+    assert scheduler.total_lateness == pytest.approx(0.0)
+
+
+def test_late_frames_are_shown_without_sleeping(scheduler, clock):
+    clock.now += 0.125
+    scheduler.wait(1)
+    assert clock.slept == []
+    assert scheduler.total_lateness == pytest.approx(0.025)
+
+
+def test_frame_is_dropped_once_its_successor_is_due(scheduler, clock):
+    clock.now += 0.19
+    assert not scheduler.should_drop(1)  # Frame 2 is due at +0.2
+    clock.now += 0.01
+    assert scheduler.should_drop(1)
+    assert scheduler.frames_dropped == 1
+
+
+def test_overrun_does_not_push_later_frames_back(scheduler, clock):
+    scheduler.wait(0)
+    clock.now += 0.15  # Frame 0 took too long
+    scheduler.wait(1)
+    scheduler.wait(2)
+    # Frame 2 is still due at +0.2, not 0.1 after frame 1 was shown
+    assert clock.now == pytest.approx(100.2)
+    assert scheduler.total_lateness == pytest.approx(0.05)
+
+
+def test_report_counts_shown_and_dropped_frames(scheduler, clock):
+    for index in range(20):
+        if index % 4 == 1:
+            clock.now = scheduler.due(index + 1)
+            assert scheduler.should_drop(index)
+            continue
+        clock.now += 0.02  # Render time
+        scheduler.wait(index)
+    scheduler.stop()
+
+    report = scheduler.report()
+    assert report["frames_shown"] == 15
+    assert report["frames_dropped"] == 5
+    # 20 slots of 0.1 s on the timeline, 15 of them shown
+    assert report["elapsed_s"] == pytest.approx(2.0)
+    assert report["achieved_fps"] == pytest.approx(7.5)
+    assert report["target_fps"] == 10
+    assert "7.5/10.0 fps, 15 shown, 5 dropped" in scheduler.format_report()
+
+
+def test_mean_lateness_is_per_frame_shown(scheduler, clock):
+    clock.now += 0.01
+    scheduler.wait(0)
+    clock.now += 0.13  # Frame 1 shown 40 ms late
+    scheduler.wait(1)
+    assert scheduler.report()["mean_lateness_ms"] == pytest.approx(25.0)
+
+
+def test_report_before_start_is_empty(clock):
+    report = PlaybackScheduler(30, clock=clock, sleep=clock.sleep).report()
+    assert report["achieved_fps"] == 0.0
+    assert report["elapsed_s"] == 0.0
+    assert report["mean_lateness_ms"] == 0.0
@@ -0,0 +1,75 @@
+import gzip
+import http.client
+import socket
+import threading
+
+import pytest
+
+from ascii_art import server
+
+
+@pytest.fixture
+def httpd(monkeypatch):
+    monkeypatch.setitem(server.SERVER_STATE, "artifact", None)
+    monkeypatch.setitem(server.SERVER_STATE, "current_file", None)
+    httpd = server.make_server(0, host="127.0.0.1")
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def fetch(httpd, headers=None, method="GET"):
+    conn = http.client.HTTPConnection("127.0.0.1", httpd.server_address[1], timeout=5)
+    try:
+        conn.request(method, "/myfile", headers=headers or {})
+        resp = conn.getresponse()
+        return resp, resp.read()
+    finally:
+        conn.close()
+
+
+def test_serves_from_memory_with_conditional_requests(httpd, tmp_path):
+    path = tmp_path / "art.html"
+    body = ("<pre>" + "@%#*+=-:. " * 500 + "</pre>").encode()
+    path.write_bytes(body)
+    server.set_current_file(path)
+    path.unlink()  # Served from memory from now on
+
+    resp, data = fetch(httpd)
+    assert resp.status == 200
+    assert resp.getheader("Content-Type") == "text/html; charset=utf-8"
+    assert resp.getheader("Cache-Control") == "no-cache"
+    assert data == body
+    etag = resp.getheader("ETag")
+
+    resp, data = fetch(httpd, {"If-None-Match": etag})
+    assert resp.status == 304
+    assert data == b""
+
+    resp, data = fetch(httpd, {"Accept-Encoding": "gzip"})
+    assert resp.getheader("Content-Encoding") == "gzip"
+    assert resp.getheader("ETag") != etag
+    assert gzip.decompress(data) == body
+
+    resp, data = fetch(httpd, {"Accept-Encoding": "gzip;q=0"})
+    assert resp.getheader("Content-Encoding") is None
+    assert data == body
+
+
+def test_slow_client_does_not_block_others(httpd, tmp_path):
+    path = tmp_path / "art.txt"
+    path.write_text("hello")
+    server.set_current_file(path)
+
+    # A client that never finishes its request line
+    stalled = socket.create_connection(httpd.server_address)
+    try:
+        stalled.sendall(b"GET /my")
+        resp, data = fetch(httpd)
+        assert resp.status == 200
+        assert resp.getheader("Content-Type") == "text/plain; charset=utf-8"
+        assert data == b"hello"
+    finally:
+        stalled.close()
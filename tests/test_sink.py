@@ -0,0 +1,59 @@
+import os
+import sys
+import threading
+
+import pytest
+
+from ascii_art import sink
+
+
+def read_all(fd):
+    chunks = []
+    while chunk := os.read(fd, 65536):
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def test_frames_are_wrapped_and_written_whole():
+    r, w = os.pipe()
+    try:
+        out = sink.FrameSink(fd=w, synchronized=True)
+        out.start()
+        out.write_frame(sink.HOME, "é\n@", memoryview(bytearray(b"#.")))
+        out.write_frame(b"")
+        out.close()
+    finally:
+        os.close(w)
+    data = read_all(r)
+    os.close(r)
+
+    frame = sink.SYNC_BEGIN + sink.HOME + "é\n@#.".encode() + sink.SYNC_END
+    # A pipe is not a tty: no cursor hiding, but the requested sync stays on
+    assert data == frame + sink.SYNC_BEGIN + sink.SYNC_END + sink.SYNC_END
+
+
+@pytest.mark.skipif(sink.termios is None, reason="needs a POSIX tty")
+@pytest.mark.parametrize("answer, supported", [(b"2", True), (b"0", False)])
+def test_query_reads_terminal_reply(monkeypatch, answer, supported):
+    import pty
+
+    master, slave = pty.openpty()
+    stdin = os.fdopen(os.dup(slave), "r")
+    monkeypatch.setattr(sys, "stdin", stdin)
+
+    def terminal():
+        # Answer the DECRQM query like a terminal would
+        request = b""
+        while not request.endswith(b"$p"):
+            request += os.read(master, 64)
+        os.write(master, b"\033[?2026;" + answer + b"$y")
+
+    thread = threading.Thread(target=terminal, daemon=True)
+    thread.start()
+    try:
+        assert sink.query_synchronized_output(slave, timeout=2) is supported
+    finally:
+        thread.join(timeout=2)
+        stdin.close()
+        os.close(slave)
+        os.close(master)
@@ -0,0 +1,59 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+# Modules that must only load on the code paths that need them
+HEAVY_MODULES = ("numpy", "cv2", "PIL", "http.server", "webbrowser")
+
+# Generous ceiling for `import ascii_art.cli` alone; a regression that pulls
+# NumPy or OpenCV back in at import time blows well past it.
+IMPORT_BUDGET_US = 150_000
+
+
+def run_python(code, *flags):
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def loaded_heavy_modules(code):
+    probe = (
+        f"{code}\n"
+        "import sys\n"
+        f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+    )
+    return run_python(probe).stdout.strip().splitlines()[-1]
+
+
+def test_cli_import_stays_light():
+    assert loaded_heavy_modules("import ascii_art.cli") == "[]"
+
+
+def test_show_charsets_stays_light():
+    code = (
+        "import sys\n"
+        "from ascii_art import cli\n"
+        "sys.argv = ['asciify', '--show-charsets']\n"
+        "try:\n"
+        "    cli.main()\n"
+        "except SystemExit:\n"
+        "    pass\n"
+    )
+    assert loaded_heavy_modules(code) == "[]"
+
+
+def test_cli_import_time_budget():
+    result = run_python("import ascii_art.cli", "-X", "importtime")
+    # Last line of -X importtime is the top-level module: "... | cumulative | name"
+    lines = result.stderr.splitlines()
+    line = [entry for entry in lines if entry.endswith("ascii_art.cli")][-1]
+    cumulative_us = int(line.split("|")[1])
+    assert cumulative_us < IMPORT_BUDGET_US
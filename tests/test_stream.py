@@ -0,0 +1,89 @@
+import http.client
+import time
+
+import pytest
+
+from ascii_art import stream
+
+
+@pytest.fixture
+def live(monkeypatch):
+    monkeypatch.setattr(stream, "HEARTBEAT_SECONDS", 0.2)
+    broadcaster = stream.Broadcaster(buffer_frames=4)
+    httpd = stream.start_stream_server(broadcaster, 0, host="127.0.0.1")
+    yield broadcaster, httpd.server_address[1]
+    broadcaster.close()
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def connect(port, path="/events"):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    conn.request("GET", path)
+    return conn, conn.getresponse()
+
+
+def read_event(resp):
+    """Reads one SSE event, skipping keep-alive comments."""
+    lines = []
+    while True:
+        line = resp.fp.readline().decode("utf-8").rstrip("\n")
+        if not line:
+            if lines:
+                return lines
+        elif not line.startswith(":"):
+            lines.append(line)
+
+
+def wait_for_viewers(broadcaster, count):
+    deadline = time.monotonic() + 5
+    while broadcaster.viewers < count:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_viewer_page(live):
+    _, port = live
+    conn, resp = connect(port, "/")
+    assert resp.status == 200
+    assert resp.getheader("Content-Type") == "text/html; charset=utf-8"
+    assert b'new EventSource("/events")' in resp.read()
+    conn.close()
+
+
+def test_frames_fan_out_to_every_viewer(live):
+    broadcaster, port = live
+    clients = [connect(port) for _ in range(3)]
+    wait_for_viewers(broadcaster, 3)
+
+    broadcaster.publish("text", "ab\ncd")
+    for conn, resp in clients:
+        assert resp.getheader("Content-Type") == "text/event-stream"
+        assert read_event(resp) == ["id: 1", "event: text", "data: ab", "data: cd"]
+
+    broadcaster.close()
+    for conn, resp in clients:
+        assert read_event(resp) == ["event: end", "data: "]
+        conn.close()
+    assert broadcaster.stats()["frames_published"] == 1
+
+
+def test_slow_viewer_drops_oldest_frames():
+    broadcaster = stream.Broadcaster(buffer_frames=3)
+    slow = broadcaster.subscribe()
+    fast = broadcaster.subscribe()
+
+    for i in range(10):
+        broadcaster.publish("text", str(i))
+        # The fast viewer keeps up and receives the very same encoded bytes
+        assert fast.pop(timeout=0) is broadcaster._latest
+
+    kept = [slow.pop(timeout=0) for _ in range(3)]
+    assert [event.split(b"data: ")[1].strip() for event in kept] == [b"7", b"8", b"9"]
+    assert slow.pop(timeout=0) is None
+    assert slow.dropped == 7
+    assert fast.dropped == 0
+
+    # Late joiners start from the newest frame
+    late = broadcaster.subscribe()
+    assert late.pop(timeout=0) is kept[-1]
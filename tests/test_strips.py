@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from ascii_art import converter, strips
+from ascii_art.charset import CHARSETS
+
+CHARSET = CHARSETS["default"]
+W, H = 24, 20
+
+
+@pytest.fixture
+def rgb():
+    rng = np.random.default_rng(11)
+    arr = rng.integers(0, 256, (H, W, 3), dtype=np.uint8)
+    # Distinct top and bottom halves, so flipped bands would show
+    arr[: H // 2, :, 0] = 255
+    return arr
+
+
+@pytest.fixture(params=["bmp", "ppm", "png", "gray.bmp"])
+def image_path(request, rgb, tmp_path):
+    """BMP is stored bottom-up, PPM top-down; PNG needs a full decode."""
+    path = tmp_path / f"in.{request.param}"
+    if request.param == "gray.bmp":
+        Image.fromarray(rgb.max(axis=2)).save(path, format="BMP")
+    else:
+        Image.fromarray(rgb).save(path)
+    return path
+
+
+def tiny_budget(width, rows):
+    """A band budget of `rows` source rows (see iter_scaled_rows)."""
+    return width * 4 * rows
+
+
+def test_raw_files_are_read_band_by_band(image_path):
+    with Image.open(image_path) as img:
+        assert strips.can_stream(img) == (image_path.suffix != ".png")
+
+
+@pytest.mark.parametrize("color", [False, True])
+def test_bands_match_whole_image_conversion(image_path, color):
+    with Image.open(image_path) as img:
+        budget = tiny_budget(W, 3)  # 7 bands
+        got = strips.image_to_ascii(img, W, H, CHARSET, color, budget=budget)
+
+    with Image.open(image_path) as img:
+        if color:
+            expected = converter.image_to_ascii_with_color(img, CHARSET)
+        else:
+            expected = converter.image_to_ascii(img, CHARSET)
+
+    if color:
+        assert np.array_equal(got.indices, expected.indices)
+        assert np.array_equal(got.colors, expected.colors)
+    else:
+        assert got == expected
+
+
+def test_downscaled_bands_match_one_band(image_path):
+    with Image.open(image_path) as img:
+        one = strips.image_to_ascii(img, W // 2, H // 2, CHARSET)
+        many = strips.image_to_ascii(
+            img, W // 2, H // 2, CHARSET, budget=tiny_budget(W, 4)
+        )
+    assert np.array_equal(many.indices, one.indices)
+    assert np.array_equal(many.colors, one.colors)
+
+
+def test_rows_taller_than_a_band_are_averaged_in_pieces(image_path):
+    with Image.open(image_path) as img:
+        whole = np.concatenate(list(strips.iter_scaled_rows(img, W // 2, 4)))
+        # 5 source rows per output row, 2 rows per band
+        pieces = strips.iter_scaled_rows(img, W // 2, 4, budget=tiny_budget(W, 2))
+        pieces = np.concatenate(list(pieces))
+    assert pieces.shape == whole.shape
+    assert np.abs(pieces.astype(int) - whole).max() <= 1
+
+
+@pytest.mark.parametrize("fmt, streamed", [("BMP", True), ("JPEG", False)])
+def test_only_raw_files_are_streamed(monkeypatch, rgb, tmp_path, fmt, streamed):
+    # Compressed files are decoded whole anyway, so they keep the usual resize
+    monkeypatch.setattr(strips, "STRIP_MIN_PIXELS", W * H - 1)
+    path = tmp_path / f"big.{fmt.lower()}"
+    Image.fromarray(rgb).save(path, format=fmt)
+    with Image.open(path) as img:
+        assert strips.should_stream(img) == streamed
@@ -0,0 +1,97 @@
+import http.server
+import threading
+
+import pytest
+
+from ascii_art import url_image_loader
+
+PNG_BYTES = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+
+
+class StandIn(http.server.BaseHTTPRequestHandler):
+    """Serves one fake image; behaviour is driven by class attributes."""
+
+    etag = '"v1"'
+    cache_control = None
+    content_type = "image/png"
+    requests = []
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        StandIn.requests.append(dict(self.headers))
+        if self.headers.get("If-None-Match") == self.etag:
+            self.send_response(304)
+            if self.cache_control:
+                self.send_header("Cache-Control", self.cache_control)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", self.content_type)
+        self.send_header("Content-Length", str(len(PNG_BYTES)))
+        self.send_header("ETag", self.etag)
+        if self.cache_control:
+            self.send_header("Cache-Control", self.cache_control)
+        self.end_headers()
+        self.wfile.write(PNG_BYTES)
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.setattr(url_image_loader, "URL_CACHE_DIR", tmp_path)
+    StandIn.requests = []
+    StandIn.etag = '"v1"'
+    StandIn.cache_control = None
+    StandIn.content_type = "image/png"
+
+    httpd = http.server.HTTPServer(("127.0.0.1", 0), StandIn)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/art/logo.png"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_revalidates_with_etag_and_reuses_body_on_304(server):
+    data, name = url_image_loader.download_image(server)
+    assert data.read() == PNG_BYTES
+    assert name == "logo.png"
+
+    data, name = url_image_loader.download_image(server)
+    assert data.read() == PNG_BYTES
+    assert name == "logo.png"
+    assert len(StandIn.requests) == 2
+    assert StandIn.requests[1].get("If-None-Match") == '"v1"'
+
+
+def test_fresh_entry_skips_the_network(server):
+    StandIn.cache_control = "public, max-age=3600"
+    url_image_loader.download_image(server)
+
+    data, _ = url_image_loader.download_image(server)
+    assert data.read() == PNG_BYTES
+    assert len(StandIn.requests) == 1
+
+
+def test_no_store_and_rejected_mime_are_not_cached(server):
+    StandIn.cache_control = "no-store, max-age=3600"
+    url_image_loader.download_image(server)
+    url_image_loader.download_image(server)
+    assert "If-None-Match" not in StandIn.requests[1]
+
+    # A 304 that says no-store drops the entry it revalidated
+    StandIn.cache_control = None
+    url_image_loader.download_image(server)
+    StandIn.cache_control = "no-store"
+    data, _ = url_image_loader.download_image(server)
+    assert data.read() == PNG_BYTES
+    url_image_loader.download_image(server)
+    assert StandIn.requests[3].get("If-None-Match") == '"v1"'
+    assert "If-None-Match" not in StandIn.requests[4]
+
+    StandIn.cache_control = None
+    StandIn.content_type = "text/html"
+    StandIn.etag = '"v2"'
+    assert url_image_loader.download_image(server) == (None, None)
+    assert url_image_loader.download_image(server) == (None, None)
@@ -0,0 +1,103 @@
+import json
+import sys
+
+import cv2
+import numpy as np
+import pytest
+
+from ascii_art import asv, cli, video_export
+from ascii_art.charset import CHARSETS
+
+CHARSET = CHARSETS["default"]
+FPS = 10.0
+FRAMES = 12
+
+
+def parse(monkeypatch, *argv):
+    monkeypatch.setattr(sys, "argv", ["asciify", *argv])
+    return cli.parse_args()
+
+
+def moving_square(index, width=32, height=24):
+    """A dark frame with a bright square one step further right each time."""
+    frame = np.full((height, width, 3), 20, dtype=np.uint8)
+    x = 2 + 2 * index
+    frame[8:16, x : x + 8] = (40, 200, 240)
+    return frame
+
+
+@pytest.fixture
+def video(tmp_path):
+    path = tmp_path / "clip.avi"
+    out = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), FPS, (32, 24))
+    for i in range(FRAMES):
+        out.write(moving_square(i % 10))
+    out.release()
+    return path
+
+
+@pytest.mark.parametrize("color", [False, True])
+def test_chunk_starts_with_a_keyframe_then_deltas(monkeypatch, color):
+    args = parse(monkeypatch, *(["--color"] if color else []))
+    frames = [moving_square(i) for i in range(4)]
+    if not color:
+        frames = [f.max(axis=2) for f in frames]
+
+    out = video_export.render_chunk(frames, CHARSET, args, newline="\r\n")
+    assert [keyframe for _, keyframe in out] == [True, False, False, False]
+
+    full = out[0][0]
+    assert full.startswith(video_export.HOME)
+    assert full.count("\r\n") == 23 and "\r\n\r\n" not in full
+    for data, _ in out[1:]:
+        # Cursor moves to the changed cells only
+        assert data.startswith("\033[") and not data.startswith(video_export.HOME)
+        assert len(data) < len(full) / 4
+
+
+def test_no_delta_repaints_every_frame(monkeypatch):
+    args = parse(monkeypatch, "--no-delta")
+    frames = [moving_square(i).max(axis=2) for i in range(3)]
+    out = video_export.render_chunk(frames, CHARSET, args)
+    assert all(keyframe for _, keyframe in out)
+
+
+def export(monkeypatch, video, tmp_path, *argv):
+    # Small chunks so the recording holds several keyframes
+    monkeypatch.setattr(video_export, "CHUNK_FRAMES", 4)
+    args = parse(
+        monkeypatch,
+        "-i", str(video), "--width", "16", "--height", "12",
+        "--output-folder", str(tmp_path / "out"), "--output-file-name", "rec",
+        "--jobs", "2", *argv,
+    )  # fmt: skip
+    return video_export.export_video(video, args)
+
+
+def test_cast_export_stamps_frames_on_the_source_timeline(monkeypatch, video, tmp_path):
+    path = export(monkeypatch, video, tmp_path)
+    lines = path.read_text(encoding="utf-8").splitlines()
+    header = json.loads(lines[0])
+    events = [json.loads(line) for line in lines[1:]]
+
+    assert header["version"] == 2
+    assert (header["width"], header["height"]) == (32, 12)
+    assert header["title"] == "clip.avi"
+    assert events[0] == [0.0, "o", video_export.CLEAR_SCREEN]
+
+    frames = events[1:]
+    assert len(frames) == FRAMES
+    for index, (time, kind, data) in enumerate(frames):
+        assert kind == "o"
+        assert time == pytest.approx(index / FPS)
+        # Every chunk of 4 opens with a full repaint, then deltas follow
+        assert data.startswith(video_export.HOME) == (index % 4 == 0)
+        assert "\n" not in data.replace("\r\n", "")
+
+
+def test_asv_export_flags_keyframes(monkeypatch, video, tmp_path):
+    path = export(monkeypatch, video, tmp_path, "--export-format", "asv")
+    with asv.AsvFile(path) as f:
+        assert (f.columns, f.rows, f.fps, len(f)) == (32, 12, FPS, FRAMES)
+        flags = f.index["flags"].tolist()
+        assert flags == [asv.KEYFRAME if i % 4 == 0 else 0 for i in range(FRAMES)]
@@ -0,0 +1,21 @@
+import numpy as np
+from PIL import Image
+
+from ascii_art import converter, writer
+from ascii_art.frame import AsciiFrame
+
+
+def test_grayscale_html_has_no_padding():
+    img = Image.fromarray(np.full((2, 4), 255, dtype=np.uint8))
+    rows = converter.image_to_ascii(img, " .<@")
+    assert rows[0] == "@ @ @ @ "
+    assert list(writer.html_lines(rows)) == ["@@@@", "@@@@"]
+
+
+def test_row_strings_and_frames_give_the_same_html():
+    rng = np.random.default_rng(3)
+    rgb = rng.integers(0, 256, (5, 7, 3), dtype=np.uint8)
+    charset = " .<&@"
+    rows = converter.image_to_ascii(Image.fromarray(rgb), charset)
+    frame = AsciiFrame(converter.array_to_frame(rgb, charset).indices, charset)
+    assert list(writer.html_lines(rows)) == list(writer.html_lines(frame))